@@ -14,51 +14,269 @@
 # You should have received a copy of the GNU General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
-from collections import deque
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .prefix_index import PrefixIndex
+
+LOGGER = logging.getLogger(__name__)
+
+def estimate_size(value):
+    """function::estimate_size(value)
+    Estimates the number of bytes of memory used by value
+    DataFrames and Series are measured with memory_usage, arrays with nbytes
+    """
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+def _in_group(key, group):
+    if isinstance(group, str):
+        return isinstance(key, str) and key.startswith(group)
+    return isinstance(key, tuple) and key[:len(group)] == group
 
 class Cache:
-    def __init__(self, size):
-        self._storage = deque(maxlen=size)
+    """class::Cache
+    A least recently used cache, holding at most size entries and, if max_bytes is given,
+    at most max_bytes of data as measured by size_function. The most recently set entry is always kept.
+
+    Keys may be strings or tuples, and groups of keys which share a prefix can be deleted together with delete_group
+
+    The cache can be shared between threads. If several threads call setdefault for the same missing key,
+    default_factory is only called once and the other threads wait for its result.
+
+    If spill is given, evicted values it accepts (see DiskCache) are written to it rather than discarded,
+    and are moved back into memory the next time they are requested
+    """
+    def __init__(self, size, max_bytes=None, size_function=estimate_size, spill=None):
+        self._size = size
+        self._max_bytes = max_bytes
+        self._size_function = size_function
+        self._spill = spill
+        self._spilling = {}
+        self._on_disk = set()
+        self._storage = OrderedDict()
+        self._index = PrefixIndex()
+        self._sizes = {}
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+        self._in_flight = {}
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    @property
+    def spill(self):
+        return self._spill
+
+    def __len__(self):
+        with self._lock:
+            return len(self._storage)
     
     def __contains__(self, key):
-        for k, v in self._storage:
-            if k == key:
+        with self._lock:
+            if key in self._storage or key in self._spilling:
                 return True
-        return False
+        return self._spill is not None and key in self._spill
 
     def __getitem__(self, key):
-        for k, v in self._storage:
-            if k == key:
-                return v
-        raise KeyError(key)
+        found, value = self._lookup(key)
+        if not found:
+            with self._lock:
+                self._misses += 1
+            raise KeyError(key)
+        return value
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._storage:
+                self._storage.move_to_end(key)
+                self._hits += 1
+                return True, self._storage[key]
+            if key in self._spilling:
+                value = self._spilling.pop(key)
+                spilled = self._set(key, value, self._sizes_for(value))
+                self._hits += 1
+            elif self._spill is None:
+                return False, None
+            else:
+                spilled = None
+        if spilled is None:
+            try:
+                value = self._spill[key]
+            except KeyError:
+                return False, None
+            size = self._sizes_for(value)
+            with self._lock:
+                if key in self._storage:
+                    value = self._storage[key]
+                    spilled = []
+                else:
+                    spilled = self._set(key, value, size, on_disk=True)
+                self._hits += 1
+        self._write_spilled(spilled)
+        return True, value
+
+    def _sizes_for(self, value):
+        return self._size_function(value) if self._max_bytes is not None else None
     
     def __setitem__(self, key, value):
-        if key in self:
-            del self[key]
-        self._storage.append((key, value))
+        size = self._sizes_for(value)
+        with self._lock:
+            spilled = self._set(key, value, size)
+        self._write_spilled(spilled)
+
+    def _set(self, key, value, size, on_disk=False):
+        if key in self._storage:
+            self._remove(key)
+        self._spilling.pop(key, None)
+        if on_disk:
+            self._on_disk.add(key)
+        elif self._spill is not None and key in self._spill:
+            del self._spill[key]
+        self._storage[key] = value
+        self._index.add(key)
+        if size is not None:
+            self._sizes[key] = size
+            self._nbytes += size
+        return self._evict()
 
     def __delitem__(self, key):
-        if key not in self:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            found = key in self._storage or self._spilling.pop(key, None) is not None
+            if key in self._storage:
+                self._remove(key)
+            if self._spill is not None and key in self._spill:
+                del self._spill[key]
+                found = True
+        if not found:
             raise KeyError(key)
-        for k, v in self._storage:
-            if k == key:
-                self._storage.remove((key, v))
-                return
+
+    def _remove(self, key, index=True):
+        if index:
+            self._index.discard(key)
+        self._nbytes -= self._sizes.pop(key, 0)
+        self._on_disk.discard(key)
+        return self._storage.pop(key)
+
+    def _evict(self):
+        spilled = []
+        while len(self._storage) > 1 and self._over_budget():
+            key = next(iter(self._storage))
+            on_disk = key in self._on_disk
+            value = self._remove(key)
+            self._evictions += 1
+            if self._spill is None or (on_disk and key in self._spill) or not self._spill.accepts(value):
+                continue
+            self._spilling[key] = value
+            spilled.append((key, value))
+        return spilled
+
+    def _write_spilled(self, spilled):
+        # Values are written outside the lock, and stay readable from _spilling until they are on disk.
+        # If the key has been set, deleted or read back in the meantime, the file written is discarded.
+        for key, value in spilled:
+            try:
+                self._spill[key] = value
+            except OSError:
+                LOGGER.warning(f'Could not write cached value for {key!r} to disk', exc_info=True)
+            with self._lock:
+                if self._spilling.get(key) is value:
+                    del self._spilling[key]
+                elif key in self._spill and key not in self._on_disk:
+                    del self._spill[key]
+
+    def _over_budget(self):
+        return (
+            (self._size is not None and len(self._storage) > self._size) or
+            (self._max_bytes is not None and self._nbytes > self._max_bytes)
+        )
     
     def delete_group(self, group):
-        to_remove = []
-        for k, v in self._storage:
-            if k.startswith(group):
-                to_remove.append((k, v))
-        for v in to_remove:
-            self._storage.remove(v)
+        """function::delete_group(self, group)
+        Deletes all string keys starting with the string group, or all tuple keys starting with the elements of the tuple group
+        Values still being computed for keys in the group are not stored when they complete
+        """
+        with self._lock:
+            for key in [k for k in self._in_flight if _in_group(k, group)]:
+                del self._in_flight[key]
+            for key in [k for k in self._spilling if _in_group(k, group)]:
+                del self._spilling[key]
+            for key in self._index.pop_prefix(group):
+                self._remove(key, index=False)
+            if self._spill is not None:
+                self._spill.delete_group(group)
             
     def setdefault(self, key, default_factory):
-        if key in self:
-            return self[key]
-        value = default_factory()
-        self[key] = value
+        found, value = self._lookup(key)
+        if found:
+            return value
+        with self._lock:
+            if key in self._storage:
+                return self[key]
+            self._misses += 1
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                future = Future()
+                self._in_flight[key] = future, threading.get_ident()
+        if in_flight is not None:
+            future, owner = in_flight
+            if owner == threading.get_ident():
+                raise RuntimeError(f'Recursive call to setdefault for key {key!r}')
+            return future.result()
+        try:
+            value = default_factory()
+        except BaseException as e:
+            with self._lock:
+                if self._in_flight.get(key, (None,))[0] is future:
+                    del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        size = self._sizes_for(value)
+        spilled = []
+        with self._lock:
+            if self._in_flight.get(key, (None,))[0] is future:
+                del self._in_flight[key]
+                spilled = self._set(key, value, size)
+        future.set_result(value)
+        self._write_spilled(spilled)
         return value
     
     def clear(self):
-        self._storage.clear()
+        with self._lock:
+            self._in_flight.clear()
+            self._spilling.clear()
+            self._on_disk.clear()
+            self._storage.clear()
+            self._index.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+            if self._spill is not None:
+                self._spill.clear()
@@ -0,0 +1,152 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`disk_cache`
+Defines the DiskCache class, which stores arrays and DataFrames in files on disk
+"""
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import count
+
+import appdirs
+import numpy as np
+import pandas as pd
+
+from .prefix_index import PrefixIndex
+
+def _default_directory():
+    directory = appdirs.user_cache_dir('PyQtToolkit')
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.mkdtemp(prefix='spill-', dir=directory)
+
+def _remove_file(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+class DiskCache:
+    """class::DiskCache
+    Stores numpy arrays, DataFrames and Series in files in directory, which defaults to a new
+    directory in the user cache directory and is deleted when the DiskCache is garbage collected.
+    Arrays are saved as .npy files and loaded memory-mapped and read-only, so only the parts
+    that are used are read from disk. DataFrames and Series are pickled.
+
+    If max_bytes is given, the least recently stored files are deleted once the total size of the files exceeds it
+    """
+    def __init__(self, directory=None, max_bytes=None):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._index = PrefixIndex()
+        self._nbytes = 0
+        self._hits = 0
+        self._file_ids = count()
+        self._lock = threading.RLock()
+        self._finalizer = None
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    @staticmethod
+    def accepts(value):
+        """function::accepts(value)
+        Returns True if value can be stored in the cache
+        """
+        if isinstance(value, np.ndarray):
+            return not value.dtype.hasobject
+        return isinstance(value, (pd.DataFrame, pd.Series))
+
+    def _get_directory(self):
+        if self._directory is None:
+            self._directory = _default_directory()
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._directory, True)
+        else:
+            os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __getitem__(self, key):
+        with self._lock:
+            filename, _ = self._entries[key]
+            self._entries.move_to_end(key)
+            self._hits += 1
+        if filename.endswith('.npy'):
+            return np.load(filename, mmap_mode='r')
+        return pd.read_pickle(filename)
+
+    def __setitem__(self, key, value):
+        if not self.accepts(value):
+            raise ValueError(f'Cannot store value of type {type(value)} on disk')
+        with self._lock:
+            filename = os.path.join(self._get_directory(), str(next(self._file_ids)))
+        if isinstance(value, np.ndarray):
+            filename += '.npy'
+            np.save(filename, value, allow_pickle=False)
+        else:
+            filename += '.pkl'
+            pd.to_pickle(value, filename)
+        size = os.path.getsize(filename)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = filename, size
+            self._index.add(key)
+            self._nbytes += size
+            while self._max_bytes is not None and len(self._entries) > 1 and self._nbytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._remove(key)
+
+    def _remove(self, key, index=True):
+        if index:
+            self._index.discard(key)
+        filename, size = self._entries.pop(key)
+        self._nbytes -= size
+        _remove_file(filename)
+
+    def delete_group(self, group):
+        with self._lock:
+            for key in self._index.pop_prefix(group):
+                self._remove(key, index=False)
+
+    def clear(self):
+        with self._lock:
+            for filename, _ in self._entries.values():
+                _remove_file(filename)
+            self._entries.clear()
+            self._index.clear()
+            self._nbytes = 0
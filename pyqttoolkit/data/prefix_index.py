@@ -0,0 +1,128 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`prefix_index`
+Defines the PrefixIndex class, which finds keys by prefix without scanning every key
+"""
+import sys
+
+class _Node:
+    __slots__ = ('children', 'key', 'has_key')
+
+    def __init__(self):
+        self.children = {}
+        self.key = None
+        self.has_key = False
+
+
+def _segments(key, separator):
+    parts = key.split(separator)
+    segments = [sys.intern(part + separator) for part in parts[:-1]]
+    if parts[-1]:
+        segments.append(parts[-1])
+    return segments
+
+
+class PrefixIndex:
+    """class::PrefixIndex
+    A trie of string and tuple keys. String keys are matched by string prefix,
+    tuple keys by their leading elements. Keys of other types are not indexed.
+
+    String keys are stored one separator-delimited segment per node, e.g. 'project:1:mean' as
+    'project:', '1:' and 'mean', so keys sharing a group prefix share nodes.
+    """
+    def __init__(self, separator=':'):
+        self._separator = separator
+        self._roots = {str: _Node(), tuple: _Node()}
+
+    def _root(self, key):
+        if isinstance(key, str):
+            return self._roots[str]
+        if isinstance(key, tuple):
+            return self._roots[tuple]
+        return None
+
+    def _elements(self, key):
+        return _segments(key, self._separator) if isinstance(key, str) else key
+
+    def add(self, key):
+        node = self._root(key)
+        if node is None:
+            return
+        for element in self._elements(key):
+            child = node.children.get(element)
+            if child is None:
+                child = node.children[element] = _Node()
+            node = child
+        node.key = key
+        node.has_key = True
+
+    def discard(self, key):
+        node = self._root(key)
+        if node is None:
+            return
+        path = []
+        for element in self._elements(key):
+            path.append((node, element))
+            node = node.children.get(element)
+            if node is None:
+                return
+        node.key = None
+        node.has_key = False
+        self._prune(node, path)
+
+    def pop_prefix(self, prefix):
+        """function::pop_prefix(self, prefix)
+        Removes and returns all keys that start with prefix
+        """
+        node = self._root(prefix)
+        if node is None:
+            return []
+        elements = self._elements(prefix)
+        partial = None
+        if isinstance(prefix, str) and elements and not elements[-1].endswith(self._separator):
+            elements, partial = elements[:-1], elements[-1]
+        path = []
+        for element in elements:
+            path.append((node, element))
+            node = node.children.get(element)
+            if node is None:
+                return []
+        keys = []
+        if partial is None:
+            if node.has_key:
+                keys.append(node.key)
+            stack = list(node.children.values())
+            node.children, node.key, node.has_key = {}, None, False
+        else:
+            matches = [element for element in node.children if element.startswith(partial)]
+            stack = [node.children.pop(element) for element in matches]
+        while stack:
+            current = stack.pop()
+            if current.has_key:
+                keys.append(current.key)
+            stack.extend(current.children.values())
+        self._prune(node, path)
+        return keys
+
+    def clear(self):
+        self._roots = {str: _Node(), tuple: _Node()}
+
+    @staticmethod
+    def _prune(node, path):
+        while path and not node.has_key and not node.children:
+            node, element = path.pop()
+            del node.children[element]
@@ -14,12 +14,61 @@
 # You should have received a copy of the GNU General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+import numpy as np
+import pandas as pd
 from PyQt5.QtCore import pyqtSignal, QAbstractTableModel, Qt, QVariant, QModelIndex, QItemSelectionModel
 
+from pyqttoolkit.data import Cache
+
+_CHUNK_SIZE = 512
+_CACHED_CHUNKS = 2048
+_MAX_CHANGED_RANGES = 64
+
+def _format(values):
+    # Formats values as str(values.iloc[i]) would. Python ints, bools and floats print the same as the
+    # numpy scalars iloc returns, so those columns are converted in one call; other numpy kinds must stay numpy scalars
+    if isinstance(values.dtype, np.dtype):
+        if values.dtype.kind in 'biu' or values.dtype == np.float64:
+            return [str(v) for v in values.to_numpy().tolist()]
+        if values.dtype.kind in 'fc':
+            return [str(v) for v in values.to_numpy()]
+    return [str(v) for v in values]
+
+def _differs(old, new):
+    differs = old != new
+    if hasattr(differs, 'to_numpy'):
+        differs = differs.to_numpy(dtype=bool, na_value=True)
+    differs = np.asarray(differs, dtype=bool)
+    # Missing values compare unequal, so only rows which differ are checked for them
+    rows = np.flatnonzero(differs)
+    differs[rows] = ~(np.asarray(pd.isna(old[rows])) & np.asarray(pd.isna(new[rows])))
+    return differs
+
+def _ranges(rows):
+    if not len(rows):
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > 1)
+    if len(breaks) >= _MAX_CHANGED_RANGES:
+        return [(rows[0], rows[-1])]
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
 class DataFrameTableModel(QAbstractTableModel):
-    def __init__(self, parent, data, display_column=None, editable=False, row_headers=False):
+    """class::DataFrameTableModel
+    A table model showing a DataFrame. If fetch_size is given, rows are made available to views
+    fetch_size at a time as they are scrolled to, rather than all at once
+
+    Cell text is formatted a chunk of rows of a column at a time, as it is first shown, and cached until the data changes
+
+    If copy is False, data and frames assigned to dataFrame are shown without being copied, and must not be changed in place.
+    Assigning a frame with the same columns and dtypes updates only the rows whose values differ, found a column at a time.
+    Assigning the frame already shown does nothing
+    """
+    def __init__(self, parent, data, display_column=None, editable=False, row_headers=False, fetch_size=None, copy=True):
         QAbstractTableModel.__init__(self, parent)
-        self._data = data.copy()
+        self._copy = copy
+        self._data = data.copy() if copy else data
         self._display_column_index = (
             0 if display_column is None
             else data.columns.get_loc(display_column)
@@ -27,14 +76,38 @@ class DataFrameTableModel(QAbstractTableModel):
         self._selection_model = QItemSelectionModel(self)
         self._editable = editable
         self._row_headers = row_headers
+        self._fetch_size = fetch_size
+        self._fetched_rows = fetch_size
+        self._formatted = Cache(_CACHED_CHUNKS)
 
     dataUpdated = pyqtSignal()
 
     def data(self, index, role=Qt.DisplayRole):
         if role in [Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole]:
-            column = self._data.columns[index.column()]
-            return str(self._data[column].iloc[index.row()])
+            chunk, offset = divmod(index.row(), _CHUNK_SIZE)
+            return self._formatted.setdefault(
+                (chunk, index.column()), lambda: self._format_chunk(index.column(), chunk)
+            )[offset]
         return QVariant()
+
+    def _format_chunk(self, column, chunk):
+        start = chunk * _CHUNK_SIZE
+        return _format(self._data.iloc[start:start + _CHUNK_SIZE, column])
+
+    def _invalidate(self, first_row=None, last_row=None):
+        if first_row is None:
+            self._formatted.clear()
+            return
+        for chunk in range(first_row // _CHUNK_SIZE, last_row // _CHUNK_SIZE + 1):
+            self._formatted.delete_group((chunk,))
+
+    def _changed_rows(self, value, rows):
+        changed = np.zeros(rows, dtype=bool)
+        for column in range(self.columnCount()):
+            changed |= _differs(self._data.iloc[:rows, column].array, value.iloc[:rows, column].array)
+        if self._row_headers:
+            changed |= _differs(self._data.index[:rows], value.index[:rows])
+        return np.flatnonzero(changed)
     
     def headerData(self, section, orientation, role=None):
         role = role or Qt.DisplayRole
@@ -55,6 +128,7 @@ class DataFrameTableModel(QAbstractTableModel):
         if role == Qt.EditRole:
             column = self._data.columns[index.column()]
             self._data[column][index.row()] = value
+            self._invalidate(index.row(), index.row())
             self.dataUpdated.emit()
             return True
         return False
@@ -63,21 +137,42 @@ class DataFrameTableModel(QAbstractTableModel):
         return len(self._data.columns)
 
     def rowCount(self, _parent=None):
-        return len(self._data)
+        if self._fetched_rows is None:
+            return len(self._data)
+        return min(len(self._data), self._fetched_rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.rowCount() < len(self._data)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        first = self.rowCount()
+        last = min(len(self._data), first + self._fetch_size) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._fetched_rows = last + 1
+        self.endInsertRows()
 
     def insertRows(self, row, count, parent=None, gen_row=None):
         parent = parent or QModelIndex()
-        if row != self.rowCount(parent):
+        if row != len(self._data):
             return False
         if count != 1:
             raise ValueError('Cannot insert more than 1 row')
 
         gen_row = gen_row or (lambda: {n: '' for n in self._data.columns})
 
-        self.beginInsertRows(parent, row, row)
+        # Rows appended after rows which have not been fetched are fetched with them
+        fetched = self.rowCount(parent) == len(self._data)
+        if fetched:
+            self.beginInsertRows(parent, row, row)
         self._data.loc[row] = gen_row()
+        self._invalidate()
+        if fetched and self._fetched_rows is not None:
+            self._fetched_rows += 1
         self.dataUpdated.emit()
-        self.endInsertRows()
+        if fetched:
+            self.endInsertRows()
         return True
 
     def removeRows(self, row, count, parent=None):
@@ -85,11 +180,18 @@ class DataFrameTableModel(QAbstractTableModel):
         if count != 1:
             raise ValueError('Cannot remove more than 1 row')
         
-        self.beginRemoveRows(parent, row, row)
+        # Rows which have not been fetched are not known to views, so are removed without signalling
+        fetched = row < self.rowCount(parent)
+        if fetched:
+            self.beginRemoveRows(parent, row, row)
         self._data.drop(row, inplace=True)
         self._data.reset_index(drop=True, inplace=True)
+        self._invalidate()
+        if fetched and self._fetched_rows is not None:
+            self._fetched_rows -= 1
         self.dataUpdated.emit()
-        self.endRemoveRows()
+        if fetched:
+            self.endRemoveRows()
         return True
 
     def moveRows(self, source_parent, source_row, count, dest_parent, dest_row):
@@ -103,6 +205,7 @@ class DataFrameTableModel(QAbstractTableModel):
         temp = self._data.iloc[dest_row].copy()
         self._data.iloc[dest_row] = self._data.iloc[source_row]
         self._data.iloc[source_row] = temp
+        self._invalidate()
         self.endMoveRows()
         self.dataUpdated.emit()
         self.selectionModel.setCurrentIndex(self.createIndex(dest_row, 0), QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
@@ -121,10 +224,51 @@ class DataFrameTableModel(QAbstractTableModel):
 
     @dataFrame.setter
     def dataFrame(self, value):
-        if self._data.size != value.size or not (self._data == value).all().all():
-            self.beginResetModel()
-            self._data = value.copy()
-            self.endResetModel()
+        if value is self._data:
+            return
+        if not (self._data.columns.equals(value.columns) and self._data.dtypes.equals(value.dtypes)):
+            self._reset(value)
+            return
+        old_rows, new_rows = len(self._data), len(value)
+        try:
+            changed = self._changed_rows(value, min(old_rows, new_rows))
+        except (TypeError, ValueError):
+            # Values which cannot be compared elementwise, such as arrays, are treated as changed
+            self._reset(value)
+            return
+        if len(changed) or old_rows != new_rows:
+            self._update(value, changed)
+
+    def _reset(self, value):
+        self.beginResetModel()
+        self._data = value.copy() if self._copy else value
+        self._fetched_rows = self._fetch_size
+        self._invalidate()
+        self.endResetModel()
+
+    def _update(self, value, changed):
+        old_rows, new_rows = len(self._data), len(value)
+        shown_rows = self.rowCount()
+        new_shown_rows = new_rows if self._fetched_rows is None else min(new_rows, self._fetched_rows)
+        if new_shown_rows < shown_rows:
+            self.beginRemoveRows(QModelIndex(), new_shown_rows, shown_rows - 1)
+        elif new_shown_rows > shown_rows:
+            self.beginInsertRows(QModelIndex(), shown_rows, new_shown_rows - 1)
+        self._data = value.copy() if self._copy else value
+        for start, end in _ranges(changed):
+            self._invalidate(start, end)
+        if old_rows != new_rows:
+            self._invalidate(min(old_rows, new_rows), max(old_rows, new_rows) - 1)
+        if new_shown_rows < shown_rows:
+            self.endRemoveRows()
+        elif new_shown_rows > shown_rows:
+            self.endInsertRows()
+
+        last_column = self.columnCount() - 1
+        for start, end in _ranges(changed[changed < self.rowCount()]):
+            self.dataChanged.emit(self.index(start, 0), self.index(end, last_column))
+            if self._row_headers:
+                self.headerDataChanged.emit(Qt.Vertical, start, end)
 
     @property
     def displayColumnIndex(self):
@@ -17,7 +17,9 @@
 """:mod:`services`
 Defines classes and functions that provide services to the models of the application
 """
-from .task_runner import TaskRunner
+from .task_runner import TaskRunner, CancellationToken
+from .task_graph import TaskGraph
+from .figure_export import FigureExporter, FigureExport, export_figures
 from .message_board import MessageBoard, MessageArgs, MessageType, MessageResponse
 from .module_service import ModuleService
 from .tool_window_service import ToolWindowService
@@ -29,4 +31,5 @@ from .autosave import Autosave
 from .hotkey_manager import HotkeyManager, HotkeyEvents
 from .theme_manager import ThemeManager
 from .project_updater import ProjectUpdater
+from .project_memoizer import ProjectMemoizer, ProjectReader
 from .file_dialog import FileDialogService
@@ -0,0 +1,126 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`figure_export`
+Defines the FigureExporter class, which renders and saves many figures in parallel processes
+"""
+import os
+from itertools import chain
+
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .task_graph import TaskGraph
+
+class FigureExport:
+    """class::FigureExport
+    Describes an image to save to filename, in the format given by its extension (e.g. png, svg or pdf).
+    The image is either drawn by calling render(figure, *args) on an empty figure of size figsize and resolution dpi,
+    or is the given figure. render, args and figure must be picklable, so render must be a module level function.
+    savefig_kwargs are passed to Figure.savefig
+    """
+    def __init__(self, filename, render=None, args=(), figure=None, figsize=None, dpi=None, **savefig_kwargs):
+        if (render is None) == (figure is None):
+            raise ValueError('Exactly one of render and figure must be given')
+        self.filename = filename
+        self.render = render
+        self.args = tuple(args)
+        self.figure = figure
+        self.figsize = tuple(figsize) if figsize is not None else None
+        self.dpi = dpi
+        self.savefig_kwargs = savefig_kwargs
+
+_FIGURES = {}
+
+def _get_figure(figsize, dpi):
+    figure = _FIGURES.get((figsize, dpi))
+    if figure is None:
+        figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(figure)
+        _FIGURES[(figsize, dpi)] = figure
+    else:
+        figure.clear()
+        figure.set_facecolor(rcParams['figure.facecolor'])
+        figure.set_edgecolor(rcParams['figure.edgecolor'])
+    return figure
+
+def _save(export):
+    if export.figure is not None:
+        figure = export.figure
+        FigureCanvasAgg(figure)
+    else:
+        figure = _get_figure(export.figsize, export.dpi)
+        export.render(figure, *export.args)
+    figure.savefig(export.filename, **export.savefig_kwargs)
+    return export.filename
+
+def export_figures(exports, update_progress=None, cancellation_token=None):
+    """function::export_figures(exports, update_progress=None, cancellation_token=None)
+    Saves each of the FigureExports in turn, reusing one figure per size and resolution, and returns the filenames
+    """
+    filenames = []
+    for i, export in enumerate(exports):
+        if cancellation_token is not None:
+            cancellation_token.raiseForCancelled()
+        filenames.append(_save(export))
+        if update_progress is not None:
+            update_progress(100 * (i + 1) / len(exports), os.path.basename(export.filename))
+    return filenames
+
+class FigureExporter:
+    """class::FigureExporter
+    Saves batches of FigureExports using the Agg renderer in the process pool of a :class:`TaskRunner`,
+    so that exporting does not block the user interface. Each batch is split into at most processes chunks,
+    defaulting to the number of CPUs, which are exported in parallel up to the limits of the task runner
+    """
+    def __init__(self, task_runner, processes=None):
+        self._task_runner = task_runner
+        self._processes = processes or os.cpu_count() or 1
+        self._graph = None
+
+    @property
+    def running(self):
+        return self._graph is not None and self._graph.running
+
+    def export(self, exports, on_completed=None, on_error=None, on_cancelled=None, description=None):
+        """function::export(self, exports, on_completed=None, on_error=None, on_cancelled=None, description=None)
+        Exports the figures
+        :param on_completed: Called with the list of filenames saved, in the order of exports
+        :param on_error: Called with a dict of the exceptions raised by each chunk that errored
+        :param on_cancelled: Called if the export was cancelled
+        """
+        if self.running:
+            raise ValueError('An export is already running')
+        exports = list(exports)
+        n_chunks = max(1, min(len(exports), self._processes))
+        chunks = [exports[i::n_chunks] for i in range(n_chunks)]
+        self._graph = TaskGraph(self._task_runner)
+        for i, chunk in enumerate(chunks):
+            self._graph.add_task(
+                i, export_figures, task_args=[chunk], use_process_pool=True, cancellable=True,
+                description=description or f'Exporting {len(exports)} figures'
+            )
+        def _completed(results):
+            filenames = list(chain.from_iterable(results[i] for i in range(n_chunks)))
+            order = list(chain.from_iterable(range(len(exports))[i::n_chunks] for i in range(n_chunks)))
+            if on_completed is not None:
+                on_completed([f for _, f in sorted(zip(order, filenames))])
+        self._graph.run(on_completed=_completed, on_error=on_error, on_cancelled=on_cancelled)
+
+    def cancel(self):
+        if self._graph is not None:
+            self._graph.cancel()
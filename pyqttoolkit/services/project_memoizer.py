@@ -0,0 +1,160 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`project_memoizer`
+Defines the ProjectMemoizer class, which caches values computed from the project until the properties they read are updated
+"""
+import threading
+from collections import defaultdict
+from functools import wraps
+
+from PyQt5.QtCore import QObject, pyqtSlot
+
+from ..data import Cache
+
+class ProjectReader:
+    """class::ProjectReader
+    A read-only view of the project, which records the names of the properties that are read.
+    Reading a method, whose dependencies cannot be known, marks the reader as depending on every property
+    """
+    _storage = {}
+
+    def __init__(self, project):
+        ProjectReader._storage[self] = {'_project': project, '_reads': set(), '_reads_all': False}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        del ProjectReader._storage[self]
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'Could not set property {name}: the project is read-only')
+
+    def __getattribute__(self, name):
+        if name.startswith('__'):
+            return object.__getattribute__(self, name)
+        storage = ProjectReader._storage[self]
+        if name == 'reads':
+            return None if storage['_reads_all'] else frozenset(storage['_reads'])
+        value = getattr(storage['_project'], name)
+        if callable(value):
+            storage['_reads_all'] = True
+        else:
+            storage['_reads'].add(name)
+        return value
+
+
+class ProjectMemoizer(QObject):
+    """class::ProjectMemoizer
+    Caches the results of functions of the project. Each result is kept until ProjectUpdater.projectUpdated
+    is emitted for one of the project properties read while computing it, or for all properties.
+    Results are also discarded if the project manager's project is replaced.
+
+    Functions are decorated with memoize, and called with the arguments after the project, which must be hashable
+    """
+    def __init__(self, project_updater, project_manager, size=128, cache=None):
+        super().__init__(project_updater)
+        self._project_manager = project_manager
+        self._cache = cache if cache is not None else Cache(size)
+        self._project = None
+        self._dependants = defaultdict(set)
+        self._reads_all = set()
+        self._computing = set()
+        self._lock = threading.Lock()
+        project_updater.projectUpdated.connect(self._on_project_updated)
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def memoize(self, function=None, name=None):
+        """function::memoize(self, function=None, name=None)
+        Decorates function(project, *args), so that calling it with *args returns the cached result if it is still valid.
+        Results are stored under the key (name, *args). If name is not given, a name unique to this call of memoize is used
+        """
+        if function is None:
+            return lambda f: self.memoize(f, name)
+        name = name or (function.__module__, function.__qualname__, object())
+        @wraps(function)
+        def _memoized(*args):
+            return self.get((name,) + args, lambda project: function(project, *args))
+        _memoized.invalidate = lambda: self.invalidate_group((name,))
+        return _memoized
+
+    def get(self, key, compute):
+        """function::get(self, key, compute)
+        Returns the cached value for key, or calls compute with a ProjectReader for the project and caches the result
+        """
+        project = self._project_manager.project
+        with self._lock:
+            if project is not self._project:
+                self._project = project
+                self._clear()
+        def _compute():
+            with self._lock:
+                self._computing.add(key)
+            try:
+                with ProjectReader(project) as reader:
+                    value = compute(reader)
+                    reads = reader.reads
+            except BaseException:
+                with self._lock:
+                    self._computing.discard(key)
+                raise
+            with self._lock:
+                self._computing.discard(key)
+                if reads is None:
+                    self._reads_all.add(key)
+                else:
+                    for prop in reads:
+                        self._dependants[prop].add(key)
+            return value
+        return self._cache.setdefault(key, _compute)
+
+    @pyqtSlot(str)
+    def _on_project_updated(self, prop):
+        self.invalidate(prop or None)
+
+    def invalidate(self, prop=None):
+        """function::invalidate(self, prop=None)
+        Discards the results which depend on prop, or all results if prop is None
+        """
+        with self._lock:
+            if prop is None:
+                self._clear()
+                return
+            keys = self._dependants.pop(prop, set()) | self._reads_all | self._computing
+            self._reads_all.clear()
+            for key in keys:
+                self._discard(key)
+
+    def invalidate_group(self, group):
+        with self._lock:
+            self._cache.delete_group(group)
+
+    def _discard(self, key):
+        try:
+            del self._cache[key]
+        except KeyError:
+            pass
+
+    def _clear(self):
+        self._dependants.clear()
+        self._reads_all.clear()
+        for key in self._computing:
+            self._discard(key)
+        self._cache.clear()
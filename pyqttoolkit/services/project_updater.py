@@ -17,6 +17,7 @@
 """:mod:`project_updater`
 Defines the ProjectUpdater class, which enables the project to be updated
 """
+import asyncio
 import inspect
 from threading import Lock
 
@@ -75,6 +76,32 @@ class UpdateCompleteEvent(QEvent):
     def exec(self):
         self._handler(self._result)
 
+def _set_future_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+def _set_future_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+class AsyncUpdateEvent(QEvent):
+    def __init__(self, update_function, updated_properties, loop, future):
+        super().__init__(QEvent.User)
+        self._update_function = update_function
+        self._updated_properties = updated_properties
+        self._loop = loop
+        self._future = future
+
+    def exec(self, update_project):
+        try:
+            result = update_project(self._update_function, self._updated_properties)
+        #pylint: disable=broad-except
+        except Exception as e:
+            self._loop.call_soon_threadsafe(_set_future_exception, self._future, e)
+        #pylint: enable=broad-except
+        else:
+            self._loop.call_soon_threadsafe(_set_future_result, self._future, result)
+
 class UpdateEvent(QEvent):
     def __init__(self, updater):
         super().__init__(QEvent.User)
@@ -131,6 +158,16 @@ class ProjectUpdater(QObject):
             self._on_project_updated(None)
         if on_completed:
             QApplication.postEvent(self, UpdateCompleteEvent(on_completed, result))
+        return result
+
+    async def update_project_async(self, update_function, updated_properties=None):
+        """function::update_project_async(self, update_function, updated_properties=None)
+        Calls update_project on the GUI thread, and waits for the result without blocking the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        QApplication.postEvent(self, AsyncUpdateEvent(update_function, updated_properties, loop, future))
+        return await future
     
     def _on_project_updated(self, prop):
         QApplication.postEvent(self, PropertyUpdatedEvent(prop))
@@ -146,4 +183,8 @@ class ProjectUpdater(QObject):
             with self.update_lock:
                 event.exec()
             return True
+        if isinstance(event, AsyncUpdateEvent):
+            with self.update_lock:
+                event.exec(self.update_project)
+            return True
         return super().event(event)
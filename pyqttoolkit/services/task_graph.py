@@ -0,0 +1,199 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`task_graph`
+Defines the task graph, which runs tasks that depend on the results of other tasks
+"""
+import logging
+from functools import partial
+from itertools import count
+
+LOGGER = logging.getLogger(__name__)
+
+_GRAPH_IDS = count()
+
+_RESERVED_ARGUMENTS = ['on_completed', 'on_error', 'on_cancelled', 'error_description', 'group', 'key', 'supersede']
+
+class _Node:
+    def __init__(self, name, task_function, dependencies, run_task_kwargs):
+        self.name = name
+        self.task_function = task_function
+        self.dependencies = dependencies
+        self.run_task_kwargs = run_task_kwargs
+
+class TaskGraph:
+    """class::TaskGraph
+    Runs tasks on a :class:`TaskRunner`, starting each task as soon as the tasks it depends on have completed.
+    Tasks that do not depend on each other run in parallel, up to the number of workers of the task runner.
+
+    Each task is passed the results of its dependencies, in the order the dependencies were given,
+    followed by its own task_args. Results are passed by reference and are not copied.
+    If a task errors or is cancelled, the tasks that depend on it are not run.
+    """
+    def __init__(self, task_runner):
+        self._task_runner = task_runner
+        self._group = f'task_graph_{next(_GRAPH_IDS)}'
+        self._nodes = {}
+        self._results = {}
+        self._errors = {}
+        self._pending = set()
+        self._running = set()
+        self._skipped = set()
+        self._on_completed = self._on_error = self._on_cancelled = None
+        self._cancelled = False
+        self._settled = True
+
+    @property
+    def results(self):
+        return self._results
+
+    @property
+    def errors(self):
+        return self._errors
+
+    @property
+    def running(self):
+        return bool(self._pending or self._running)
+
+    def add_task(self, name, task_function, dependencies=None, **run_task_kwargs):
+        """function::add_task(self, name, task_function, dependencies=None, **run_task_kwargs)
+        :param name: The name of the task, used to refer to it in the dependencies of other tasks
+        :param task_function: The function to execute
+        :param dependencies: The names of the tasks whose results are passed to this task
+        :param run_task_kwargs: Other arguments to pass to :meth:`TaskRunner.run_task`
+        """
+        if self.running:
+            raise ValueError('Cannot add a task while the graph is running')
+        if name in self._nodes:
+            raise ValueError(f'A task named {name} has already been added')
+        reserved = [a for a in _RESERVED_ARGUMENTS if a in run_task_kwargs]
+        if reserved:
+            raise ValueError(f'Cannot set {", ".join(reserved)} for a task in a task graph')
+        self._nodes[name] = _Node(name, task_function, list(dependencies or []), run_task_kwargs)
+        return name
+
+    def run(self, on_completed=None, on_error=None, on_cancelled=None):
+        """function::run(self, on_completed=None, on_error=None, on_cancelled=None)
+        Runs the tasks in the graph
+        :param on_completed: Called with a dict of the results of each task when all tasks have completed
+        :param on_error: Called with a dict of the exceptions raised by each task that errored
+        :param on_cancelled: Called if any task was cancelled and none errored
+        """
+        if self.running:
+            raise ValueError('The graph is already running')
+        self._validate()
+        self._on_completed, self._on_error, self._on_cancelled = on_completed, on_error, on_cancelled
+        self._results = {}
+        self._errors = {}
+        self._skipped = set()
+        self._cancelled = False
+        self._settled = False
+        self._pending = set(self._nodes)
+        self._start_ready_tasks()
+        self._finish_if_settled()
+
+    def cancel(self):
+        """function::cancel(self)
+        Cancels the running tasks, and prevents any further tasks from starting
+        """
+        if not self.running:
+            return
+        self._cancelled = True
+        self._skipped.update(self._pending)
+        self._pending.clear()
+        self._task_runner.cancel(self._group)
+        self._finish_if_settled()
+
+    def _validate(self):
+        for node in self._nodes.values():
+            unknown = [d for d in node.dependencies if d not in self._nodes]
+            if unknown:
+                raise ValueError(f'Task {node.name} depends on unknown tasks {", ".join(map(str, unknown))}')
+        visited = set()
+        visiting = set()
+        def _visit(name):
+            if name in visiting:
+                raise ValueError(f'Task {name} depends on itself')
+            if name in visited:
+                return
+            visiting.add(name)
+            for dependency in self._nodes[name].dependencies:
+                _visit(dependency)
+            visiting.remove(name)
+            visited.add(name)
+        for name in self._nodes:
+            _visit(name)
+
+    def _start_ready_tasks(self):
+        for name in [n for n in self._nodes if n in self._pending]:
+            node = self._nodes[name]
+            if any(d in self._skipped for d in node.dependencies):
+                self._pending.remove(name)
+                self._skipped.add(name)
+            elif all(d in self._results for d in node.dependencies):
+                self._pending.remove(name)
+                self._start_task(node)
+
+    def _start_task(self, node):
+        kwargs = dict(node.run_task_kwargs)
+        task_args = [self._results[d] for d in node.dependencies] + list(kwargs.pop('task_args', None) or [])
+        self._running.add(node.name)
+        LOGGER.debug('Starting task %s of %s', node.name, self._group)
+        self._task_runner.run_task(
+            node.task_function, task_args=task_args,
+            on_completed=partial(self._task_completed, node.name),
+            on_error=partial(self._task_errored, node.name),
+            on_cancelled=partial(self._task_cancelled, node.name),
+            group=self._group, **kwargs
+        )
+
+    def _task_completed(self, name, result):
+        self._running.discard(name)
+        self._results[name] = result
+        if not self._cancelled:
+            self._start_ready_tasks()
+        self._finish_if_settled()
+
+    def _task_errored(self, name, exception):
+        self._running.discard(name)
+        self._errors[name] = exception
+        self._skipped.add(name)
+        self._start_ready_tasks()
+        self._finish_if_settled()
+
+    def _task_cancelled(self, name):
+        self._running.discard(name)
+        self._cancelled = True
+        self._skipped.add(name)
+        self._skipped.update(self._pending)
+        self._pending.clear()
+        self._finish_if_settled()
+
+    def _finish_if_settled(self):
+        if self.running or self._settled:
+            return
+        self._settled = True
+        on_completed, on_error, on_cancelled = self._on_completed, self._on_error, self._on_cancelled
+        self._on_completed = self._on_error = self._on_cancelled = None
+        if self._errors:
+            if on_error is None:
+                raise next(iter(self._errors.values()))
+            on_error(self._errors)
+        elif self._cancelled or self._skipped:
+            if on_cancelled is not None:
+                on_cancelled()
+        elif on_completed is not None:
+            on_completed(self._results)
@@ -17,27 +17,44 @@
 """:mod:`task_runner`
 Defines the task runner
 """
+import asyncio
 import logging
 import inspect
+import threading
+import time
+import os
+import multiprocessing
+from contextvars import ContextVar
+from itertools import count
+from queue import PriorityQueue, Empty
 
-from PyQt5.QtCore import QObject, pyqtSignal, QEvent
+from PyQt5.QtCore import QObject, pyqtSignal, QEvent, QTimer
 from PyQt5.QtWidgets import QApplication
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
 
 from ..properties import AutoProperty
 from ..exceptions import TaskCancelled
 
 LOGGER = logging.getLogger(__name__)
 
+_PROCESS_POLL_INTERVAL = 0.05
+
+_CURRENT_WORKER = ContextVar('current_worker', default=None)
+
+def _current_worker():
+    return _CURRENT_WORKER.get()
+
 class BusyArgs(QObject):
-    def __init__(self, busy, indeterminate=True, cancellable=False, description=None):
+    def __init__(self, busy, indeterminate=True, cancellable=False, description=None, group=None):
         QObject.__init__(self, None)
         self._busy = busy
         self._indeterminate = indeterminate
         self._cancellable = cancellable
         self._description = description
+        self._group = group
         self._progress = 0
+        self._started = None
     
     cancelled = pyqtSignal()
     cancelComplete = pyqtSignal()
@@ -47,15 +64,49 @@ class BusyArgs(QObject):
     def description(self):
         return self._description
 
+    @property
+    def group(self):
+        return self._group
+
     @property
     def progress(self):
         return self._progress
 
     def updateProgress(self, progress, description):
-        self._progress = max(99, float(progress))
+        self._progress = min(99, float(progress))
         self._description = description
         self.progressChanged.emit(progress, description)
 
+    def markStarted(self):
+        self._started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """property::elapsed
+        The number of seconds since the task started, or None if it has not started
+        """
+        return time.monotonic() - self._started if self._started is not None else None
+
+    @property
+    def throughput(self):
+        """property::throughput
+        The average progress made per second, or None if it cannot be estimated yet
+        """
+        elapsed = self.elapsed
+        if not elapsed or not self._progress:
+            return None
+        return self._progress / elapsed
+
+    @property
+    def eta(self):
+        """property::eta
+        The estimated number of seconds until the task completes, or None if it cannot be estimated yet
+        """
+        throughput = self.throughput
+        if not throughput:
+            return None
+        return max(0.0, 100 - self._progress) / throughput
+
     @property
     def busy(self):
         return self._busy
@@ -73,8 +124,119 @@ class BusyArgs(QObject):
             self.cancelled.emit()
 
 
+class CancellationToken:
+    """class::CancellationToken
+    Passed to a task to signal that the task has been cancelled
+    """
+    def __init__(self, event=None):
+        self._event = event or threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def isCancelled(self):
+        return self._event.is_set()
+
+    def raiseForCancelled(self):
+        if self.isCancelled():
+            raise TaskCancelled()
+
+
+class TaskMetrics:
+    """class::TaskMetrics
+    The timings recorded for a single task, in seconds
+    """
+    def __init__(self, description, group, outcome, queue_wait, run_time, callback_time, progress_updates, progress_events):
+        self.description = description
+        self.group = group
+        self.outcome = outcome
+        self.queue_wait = queue_wait
+        self.run_time = run_time
+        self.callback_time = callback_time
+        self.progress_updates = progress_updates
+        self.progress_events = progress_events
+
+    def __repr__(self):
+        return (
+            f'TaskMetrics(description={self.description!r}, outcome={self.outcome!r}, '
+            f'queue_wait={self.queue_wait:.3f}, run_time={self.run_time:.3f}, callback_time={self.callback_time:.3f}, '
+            f'progress_updates={self.progress_updates}, progress_events={self.progress_events})'
+        )
+
+
+class TaskSummary:
+    """class::TaskSummary
+    Aggregates the metrics of all tasks with the same description
+    """
+    metric_names = ['queue_wait', 'run_time', 'callback_time', 'progress_updates', 'progress_events']
+
+    def __init__(self, description):
+        self._description = description
+        self._count = 0
+        self._outcomes = {}
+        self._totals = dict.fromkeys(self.metric_names, 0)
+        self._maxima = dict.fromkeys(self.metric_names, 0)
+
+    @property
+    def description(self):
+        return self._description
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def outcomes(self):
+        return dict(self._outcomes)
+
+    def add(self, metrics):
+        self._count += 1
+        self._outcomes[metrics.outcome] = self._outcomes.get(metrics.outcome, 0) + 1
+        for name in self.metric_names:
+            value = getattr(metrics, name)
+            self._totals[name] += value
+            self._maxima[name] = max(self._maxima[name], value)
+
+    def total(self, metric_name):
+        return self._totals[metric_name]
+
+    def mean(self, metric_name):
+        return self._totals[metric_name] / self._count if self._count else 0
+
+    def max(self, metric_name):
+        return self._maxima[metric_name]
+
+
+class TaskStatistics:
+    """class::TaskStatistics
+    Collects the metrics of completed tasks, grouped by task description
+    """
+    def __init__(self):
+        self._summaries = {}
+
+    def record(self, metrics):
+        if metrics.description not in self._summaries:
+            self._summaries[metrics.description] = TaskSummary(metrics.description)
+        self._summaries[metrics.description].add(metrics)
+
+    def __getitem__(self, description):
+        return self._summaries[description]
+
+    def __contains__(self, description):
+        return description in self._summaries
+
+    def summaries(self, metric_name='run_time'):
+        """function::summaries(self, metric_name='run_time')
+        Returns the summaries of all task descriptions, highest total of metric_name first
+        """
+        return sorted(self._summaries.values(), key=lambda s: s.total(metric_name), reverse=True)
+
+    def clear(self):
+        self._summaries.clear()
+
+
 class Worker:
-    def __init__(self, task_runner, f, args, busy_args, on_completed, on_cancelled, on_error, error_description):
+    def __init__(self, task_runner, f, args, busy_args, on_completed, on_cancelled, on_error, error_description, group=None, priority=0, key=None, description=None):
         self._task_runner = task_runner
         self._f = f
         self._args = args
@@ -83,26 +245,330 @@ class Worker:
         self._on_cancelled = on_cancelled
         self._on_error = on_error
         self._error_description = error_description
+        self._group = group
+        self._priority = priority
+        self._key = key
+        self._superseded = False
+        self._cancellation_token = CancellationToken()
+        self._progress_lock = threading.Lock()
+        self._pending_progress = None
+        self._description = description
+        self._submitted = time.monotonic()
+        self._started = None
+        self._finished = None
+        self._progress_updates = 0
+        self._progress_events = 0
+
+    @property
+    def busy_args(self):
+        return self._busy_args
+
+    @property
+    def group(self):
+        return self._group
+
+    @property
+    def priority(self):
+        return self._priority
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def cancellation_token(self):
+        return self._cancellation_token
+
+    @property
+    def superseded(self):
+        return self._superseded
+
+    def cancel(self):
+        self._cancellation_token.cancel()
+
+    def supersede(self):
+        self._superseded = True
+        self.cancel()
+
+    def isCancelled(self):
+        return self._cancellation_token.isCancelled()
+
+    def update_progress(self, percent, message):
+        with self._progress_lock:
+            post = self._pending_progress is None
+            self._pending_progress = float(percent), message
+            self._progress_updates += 1
+            if post:
+                self._progress_events += 1
+        if post:
+            QApplication.postEvent(self._task_runner, ProgressUpdatedEvent(float(percent), message, self))
+
+    def take_progress(self):
+        """function::take_progress(self)
+        Returns the latest (percent, message) reported since the last call, or None
+        """
+        with self._progress_lock:
+            progress, self._pending_progress = self._pending_progress, None
+        return progress
+
+    def metrics(self, outcome, callback_time):
+        """function::metrics(self, outcome, callback_time)
+        Returns the :class:`TaskMetrics` of the task, once it has finished
+        """
+        finished = self._finished if self._finished is not None else time.monotonic()
+        started = self._started if self._started is not None else finished
+        return TaskMetrics(
+            self._description, self._group, outcome,
+            queue_wait=started - self._submitted, run_time=finished - started, callback_time=callback_time,
+            progress_updates=self._progress_updates, progress_events=self._progress_events
+        )
     
     def run(self):
+        if self.isCancelled():
+            self._finished = time.monotonic()
+            QApplication.postEvent(self._task_runner, CancelledEvent(self._on_cancelled, self))
+            return
         if self._busy_args:
-            QApplication.postEvent(self._task_runner, BusyEvent(self._busy_args))
+            QApplication.postEvent(self._task_runner, BusyEvent(self._busy_args, self))
+        current = _CURRENT_WORKER.set(self)
+        self._started = time.monotonic()
         try:
-            result = self._f(*self._args.args, **self._args.kwargs)
+            event = ResultEvent(self._execute(), self._on_completed, self)
         except TaskCancelled:
-            QApplication.postEvent(self._task_runner, CancelledEvent(self._on_cancelled))
+            event = CancelledEvent(self._on_cancelled, self)
         #pylint: disable=broad-except
         except Exception as e:
-            QApplication.postEvent(self._task_runner, ErrorEvent(e, self._on_error, self._error_description))
+            event = ErrorEvent(e, self._on_error, self._error_description, self)
+        #pylint: enable=broad-except
+        finally:
+            self._finished = time.monotonic()
+            _CURRENT_WORKER.reset(current)
+        QApplication.postEvent(self._task_runner, event)
+
+    def _execute(self):
+        return self._f(*self._args.args, **self._args.kwargs)
+
+    def _post_outcome(self, future):
+        self._finished = time.monotonic()
+        try:
+            result = future.result()
+        except (TaskCancelled, CancelledError):
+            QApplication.postEvent(self._task_runner, CancelledEvent(self._on_cancelled, self))
+        #pylint: disable=broad-except
+        except Exception as e:
+            QApplication.postEvent(self._task_runner, ErrorEvent(e, self._on_error, self._error_description, self))
         #pylint: enable=broad-except
         else:
-            QApplication.postEvent(self._task_runner, ResultEvent(result, self._on_completed))
+            QApplication.postEvent(self._task_runner, ResultEvent(result, self._on_completed, self))
+
+
+class AsyncWorker(Worker):
+    """class::AsyncWorker
+    Runs a coroutine function on an asyncio event loop
+    """
+    def __init__(self, *args, loop, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop = loop
+        self._future = None
+
+    def cancel(self):
+        super().cancel()
+        if self._future is not None:
+            self._future.cancel()
+
+    def run(self):
+        if self.isCancelled():
+            self._finished = time.monotonic()
+            QApplication.postEvent(self._task_runner, CancelledEvent(self._on_cancelled, self))
+            return
+        if self._busy_args:
+            QApplication.postEvent(self._task_runner, BusyEvent(self._busy_args, self))
+        self._started = time.monotonic()
+        self._future = asyncio.run_coroutine_threadsafe(self._execute(), self._loop)
+        self._future.add_done_callback(self._post_outcome)
+
+    async def _execute(self):
+        _CURRENT_WORKER.set(self)
+        return await self._f(*self._args.args, **self._args.kwargs)
+
+
+class EventLoopThread:
+    """class::EventLoopThread
+    Runs an asyncio event loop on a dedicated background thread
+    """
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='TaskRunner_EventLoop', daemon=True)
+        self._thread.start()
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class _ProcessProgress:
+    def __init__(self, progress_queue, interval):
+        self._progress_queue = progress_queue
+        self._interval = interval
+        self._last_sent = None
+        self._pending = None
+
+    def __call__(self, percent, message):
+        self._pending = float(percent), message
+        now = time.monotonic()
+        if self._last_sent is None or now - self._last_sent >= self._interval:
+            self.flush()
+            self._last_sent = now
+
+    def flush(self):
+        if self._pending is not None:
+            self._progress_queue.put(self._pending)
+            self._pending = None
+
+
+def _run_in_process(f, args, kwargs, progress_queue, cancelled_event, progress_interval):
+    progress = None
+    if progress_queue is not None:
+        progress = kwargs['update_progress'] = _ProcessProgress(progress_queue, progress_interval)
+    if cancelled_event is not None:
+        kwargs['cancellation_token'] = CancellationToken(cancelled_event)
+    try:
+        return f(*args, **kwargs)
+    finally:
+        if progress is not None:
+            progress.flush()
+
+
+class _ProcessMonitor:
+    """class::_ProcessMonitor
+    Forwards progress from the running process tasks, polling their queues on a single shared thread
+    """
+    def __init__(self, interval):
+        self._interval = interval
+        self._workers = set()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def add(self, worker):
+        with self._condition:
+            self._workers.add(worker)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='TaskRunner_ProcessMonitor', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, worker):
+        with self._condition:
+            self._workers.discard(worker)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._workers:
+                    self._condition.wait()
+                workers = list(self._workers)
+            for worker in workers:
+                try:
+                    worker.forward_progress()
+                #pylint: disable=broad-except
+                except Exception:
+                    LOGGER.exception('Failed to forward the progress of a process task')
+                #pylint: enable=broad-except
+            time.sleep(self._interval)
+
+
+class ProcessWorker(Worker):
+    """class::ProcessWorker
+    Runs a task in a process pool, forwarding progress and cancellation between the processes
+
+    The worker does not block a thread while the task runs: the outcome is posted from the future's done callback,
+    progress is forwarded by the shared monitor, and cancellation is passed on when the task is cancelled.
+    on_finished is called with the worker once a task it started has finished
+    """
+    def __init__(self, *args, process_pool, manager, monitor, progress_interval, on_finished, send_progress=False, send_cancellation_token=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._process_pool = process_pool
+        self._manager = manager
+        self._monitor = monitor
+        self._progress_interval = progress_interval
+        self._on_finished = on_finished
+        self._send_progress = send_progress
+        self._send_cancellation_token = send_cancellation_token
+        self._process_lock = threading.Lock()
+        self._forward_lock = threading.Lock()
+        self._future = None
+        self._cancelled_event = None
+        self._progress_queue = None
+
+    def cancel(self):
+        super().cancel()
+        with self._process_lock:
+            future, cancelled_event = self._future, self._cancelled_event
+        if cancelled_event is not None:
+            cancelled_event.set()
+        if future is not None:
+            future.cancel()
+
+    def run(self):
+        """function::run(self)
+        Submits the task to the process pool, returning False if it was cancelled before it started
+        """
+        if self.isCancelled():
+            self._finished = time.monotonic()
+            QApplication.postEvent(self._task_runner, CancelledEvent(self._on_cancelled, self))
+            return False
+        if self._busy_args:
+            QApplication.postEvent(self._task_runner, BusyEvent(self._busy_args, self))
+        self._started = time.monotonic()
+        progress_queue = self._manager.Queue() if self._send_progress else None
+        cancelled_event = self._manager.Event() if self._send_cancellation_token else None
+        future = self._process_pool.submit(
+            _run_in_process, self._f, self._args.args, self._args.kwargs,
+            progress_queue, cancelled_event, self._progress_interval
+        )
+        with self._process_lock:
+            self._future, self._cancelled_event, self._progress_queue = future, cancelled_event, progress_queue
+        if self.isCancelled():
+            self.cancel()
+        if progress_queue is not None:
+            self._monitor.add(self)
+        future.add_done_callback(self._post_outcome)
+        return True
+
+    def forward_progress(self):
+        """function::forward_progress(self)
+        Reports the progress the process has sent since the last call
+        """
+        with self._forward_lock:
+            progress_queue = self._progress_queue
+            if progress_queue is None:
+                return
+            while True:
+                try:
+                    percent, message = progress_queue.get_nowait()
+                except Empty:
+                    return
+                self.update_progress(percent, message)
+
+    def _post_outcome(self, future):
+        self._monitor.remove(self)
+        self.forward_progress()
+        super()._post_outcome(future)
+        self._on_finished(self)
 
 class ProgressUpdatedEvent(QEvent):
-    def __init__(self, progress, message):
+    def __init__(self, progress, message, worker=None):
         super().__init__(QEvent.User)
         self._progress = progress
         self._message = message
+        self._worker = worker
     
     @property
     def progress(self):
@@ -112,20 +578,30 @@ class ProgressUpdatedEvent(QEvent):
     def message(self):
         return self._message
 
+    @property
+    def worker(self):
+        return self._worker
+
 class CancelledEvent(QEvent):
-    def __init__(self, on_cancelled):
+    def __init__(self, on_cancelled, worker=None):
         super().__init__(QEvent.User)
         self._on_cancelled = on_cancelled
+        self._worker = worker
     
     @property
     def on_cancelled(self):
         return self._on_cancelled
 
+    @property
+    def worker(self):
+        return self._worker
+
 class ResultEvent(QEvent):
-    def __init__(self, result, on_completed=None):
+    def __init__(self, result, on_completed=None, worker=None):
         super().__init__(QEvent.User)
         self._result = result
         self._on_completed = on_completed
+        self._worker = worker
     
     @property
     def result(self):
@@ -135,12 +611,17 @@ class ResultEvent(QEvent):
     def on_completed(self):
         return self._on_completed
 
+    @property
+    def worker(self):
+        return self._worker
+
 class ErrorEvent(QEvent):
-    def __init__(self, exception, on_error, error_description):
+    def __init__(self, exception, on_error, error_description, worker=None):
         super().__init__(QEvent.User)
         self._exception = exception
         self._on_error = on_error
         self._error_description = error_description
+        self._worker = worker
     
     @property
     def exception(self):
@@ -154,15 +635,24 @@ class ErrorEvent(QEvent):
     def error_description(self):
         return self._error_description
 
+    @property
+    def worker(self):
+        return self._worker
+
 class BusyEvent(QEvent):
-    def __init__(self, busy_args):
+    def __init__(self, busy_args, worker=None):
         super().__init__(QEvent.User)
         self._busy_args = busy_args
+        self._worker = worker
     
     @property
     def args(self):
         return self._busy_args
 
+    @property
+    def worker(self):
+        return self._worker
+
 class TaskArgs:
     def __init__(self, args, kwargs):
         self.args = args
@@ -170,107 +660,320 @@ class TaskArgs:
 
 class TaskRunner(QObject):
     """class::TaskRunner
-    Runs tasks on a background thread
+    Runs tasks on a pool of background threads
+
+    Queued tasks are started in order of priority (highest first), then in order of submission
+
+    Tasks run with use_process_pool are executed in a pool of up to max_processes processes,
+    without occupying one of the max_workers threads
+
+    Progress reported by tasks is coalesced, and delivered at most max_progress_rate times per second
+
+    Coroutine functions are run concurrently on an asyncio event loop in a dedicated thread, rather than in the pool
+
+    The queue wait, run time and completion callback time of each task are recorded in :attr:`statistics`
+    and emitted with taskMeasured
     """
-    def __init__(self, parent):
+    def __init__(self, parent, max_workers=1, max_processes=None, max_progress_rate=30):
         QObject.__init__(self, parent)
-        self._is_cancelled = False
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='TaskRunner_Thread')
+        self._progress_interval = 1.0 / max_progress_rate
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(int(1000 * self._progress_interval))
+        self._progress_timer.timeout.connect(self._deliver_progress)
+        self._progress_pending = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='TaskRunner_Thread')
+        self._max_processes = max_processes
+        self._process_pool = None
+        self._manager = None
+        self._process_monitor = _ProcessMonitor(_PROCESS_POLL_INTERVAL)
+        self._process_queue = PriorityQueue()
+        self._running_processes = 0
+        self._event_loop_thread = None
+        self._queue = PriorityQueue()
+        self._sequence = count()
+        self._workers = []
+        self._running = []
+        self._keyed_workers = {}
+        self._statistics = TaskStatistics()
+        self._lock = threading.Lock()
 
-    def run_task(self, task_function, task_args=None, on_completed=None, on_cancelled=None, on_error=None, description=None, error_description=None, show_progress=True, cancellable=False, force_indeterminate_start=False, **kwargs):
+    def run_task(self, task_function, task_args=None, on_completed=None, on_cancelled=None, on_error=None, description=None, error_description=None, show_progress=True, cancellable=False, force_indeterminate_start=False, group=None, priority=0, use_process_pool=False, key=None, supersede=False, **kwargs):
         """function::runTask(self, task_function, task_args, on_completed, on_error)
         :param task_function: The function to execute
         :param task_args: The arguments to pass to the function
         :param on_completed: The function to execute when the task completes
         :param on_error: The function to execute when the task errors
+        :param group: The name of the group the task belongs to, used to cancel related tasks together
+        :param priority: Tasks with a higher priority are started before queued tasks with a lower priority
+        :param use_process_pool: Run the task in a separate process. The task function, arguments and result must be picklable
+        :param key: Identifies tasks which compute the same thing, e.g. the data for a particular plot
+        :param supersede: If True, cancel the previous task with the same key and discard its result
+
+        If the task function accepts an update_progress argument, it is passed a function to report progress.
+        If the task function accepts a cancellation_token argument, it is passed a :class:`CancellationToken`
+
+        If the task function is a coroutine function, it is run on :attr:`event_loop`
+        and cancelling the task also cancels the coroutine
         """
+        if supersede and key is None:
+            raise ValueError('A key must be provided to supersede a task')
+        is_coroutine = inspect.iscoroutinefunction(task_function)
+        if is_coroutine and use_process_pool:
+            raise ValueError('Coroutine functions cannot be run in the process pool')
         LOGGER.info('Starting task "%s"...', description)
         task_args = task_args or []
 
-        kwargs = {}
+        task_kwargs = {}
 
         parameters = inspect.signature(task_function).parameters
 
         if 'update_progress' in parameters:
-            kwargs['update_progress'] = self.update_progress
             indeterminate = force_indeterminate_start
         else:
             indeterminate = True
 
-        busy_args = BusyArgs(True, indeterminate, cancellable, description) if show_progress else None
+        busy_args = BusyArgs(True, indeterminate, cancellable, description, group) if show_progress else None
 
-        worker = Worker(
-            self, task_function, TaskArgs(task_args, kwargs),
+        worker_args = (self, task_function, TaskArgs(task_args, task_kwargs))
+        worker_kwargs = dict(
             busy_args=busy_args, on_completed=on_completed,
             on_cancelled=on_cancelled, on_error=on_error,
-            error_description=error_description
+            error_description=error_description,
+            group=group, priority=priority, key=key, description=description
         )
-        self._executor.submit(worker.run)
+        if use_process_pool:
+            process_pool, manager = self._get_process_pool()
+            worker = ProcessWorker(
+                *worker_args, **worker_kwargs,
+                process_pool=process_pool, manager=manager, monitor=self._process_monitor,
+                progress_interval=self._progress_interval, on_finished=self._process_task_finished,
+                send_progress='update_progress' in parameters,
+                send_cancellation_token='cancellation_token' in parameters
+            )
+        else:
+            if is_coroutine:
+                worker = AsyncWorker(*worker_args, **worker_kwargs, loop=self.event_loop)
+            else:
+                worker = Worker(*worker_args, **worker_kwargs)
+            if 'update_progress' in parameters:
+                task_kwargs['update_progress'] = worker.update_progress
+            if 'cancellation_token' in parameters:
+                task_kwargs['cancellation_token'] = worker.cancellation_token
+
+        with self._lock:
+            self._workers.append(worker)
+            previous = self._keyed_workers.get(key) if key is not None else None
+            if key is not None:
+                self._keyed_workers[key] = worker
+        if supersede and previous is not None:
+            LOGGER.debug('Superseding task "%s"', key)
+            previous.supersede()
+        if is_coroutine:
+            worker.run()
+        elif use_process_pool:
+            self._process_queue.put((-priority, next(self._sequence), worker))
+            self._start_process_tasks()
+        else:
+            self._queue.put((-priority, next(self._sequence), worker))
+            self._executor.submit(self._run_next)
+
+    @property
+    def event_loop(self):
+        """property::event_loop
+        The asyncio event loop that coroutine tasks are run on, started on first use
+        """
+        if self._event_loop_thread is None:
+            self._event_loop_thread = EventLoopThread()
+        return self._event_loop_thread.loop
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            context = multiprocessing.get_context('spawn')
+            self._manager = context.Manager()
+            self._process_pool = ProcessPoolExecutor(max_workers=self._max_processes, mp_context=context)
+        return self._process_pool, self._manager
+
+    def _run_next(self):
+        _, _, worker = self._queue.get()
+        worker.run()
+
+    def _start_process_tasks(self):
+        max_processes = self._max_processes or os.cpu_count() or 1
+        while True:
+            with self._lock:
+                if self._running_processes >= max_processes or self._process_queue.empty():
+                    return
+                _, _, worker = self._process_queue.get()
+                self._running_processes += 1
+            if not worker.run():
+                with self._lock:
+                    self._running_processes -= 1
+
+    def _process_task_finished(self, _worker):
+        with self._lock:
+            self._running_processes -= 1
+        self._start_process_tasks()
     
+    @property
+    def statistics(self):
+        """property::statistics
+        The :class:`TaskStatistics` of the tasks that have finished
+        """
+        return self._statistics
+
+    def _record_metrics(self, worker, outcome, callback_time=0.0):
+        if worker is None:
+            return
+        metrics = worker.metrics(outcome, callback_time)
+        self._statistics.record(metrics)
+        LOGGER.debug('Task metrics: %s', metrics)
+        self.taskMeasured.emit(metrics)
+
     def update_progress(self, percent, message):
-        QApplication.postEvent(self, ProgressUpdatedEvent(float(percent), message))
+        worker = _current_worker()
+        if worker is not None:
+            worker.update_progress(percent, message)
+        else:
+            QApplication.postEvent(self, ProgressUpdatedEvent(float(percent), message))
     
+    def _deliver_progress(self):
+        pending, self._progress_pending = self._progress_pending, []
+        for worker in pending:
+            progress = worker.take_progress()
+            if progress is not None and worker.busy_args is not None:
+                worker.busy_args.updateProgress(*progress)
+
     def event(self, event):
+        if isinstance(event, (ResultEvent, CancelledEvent, ErrorEvent)) and event.worker is not None and event.worker.superseded:
+            LOGGER.info('Task superseded')
+            self._finish(event.worker)
+            self._record_metrics(event.worker, 'superseded')
+            return True
         if isinstance(event, ProgressUpdatedEvent):
-            if self.busy is not None:
-                self.busy.updateProgress(float(event.progress), event.message)
+            if event.worker is None:
+                if self.busy is not None:
+                    self.busy.updateProgress(float(event.progress), event.message)
+            elif event.worker not in self._progress_pending:
+                self._progress_pending.append(event.worker)
+                if not self._progress_timer.isActive():
+                    self._progress_timer.start()
             return True
         elif isinstance(event, BusyEvent):
+            worker = event.worker
+            self._running.append(worker)
+            event.args.markStarted()
             self.busy = event.args
-            self.busy.cancelled.connect(self.cancel)
+            if worker is not None:
+                self.busy.cancelled.connect(lambda: self._cancel_worker(worker))
+            else:
+                self.busy.cancelled.connect(self.cancel)
+            self.busyTasksChanged.emit(self.busyTasks)
             return True
         elif isinstance(event, ResultEvent):
             LOGGER.info('Task complete')
-            self.reset()
+            self._finish(event.worker)
+            callback_start = time.monotonic()
             if event.on_completed is not None:
                 event.on_completed(event.result)
+            self._record_metrics(event.worker, 'completed', time.monotonic() - callback_start)
             self.taskCompleted.emit()
             return True
         elif isinstance(event, CancelledEvent):
             LOGGER.info('Task cancelled')
-            self.reset()
-            self.busy.cancelComplete.emit()
+            busy_args = event.worker.busy_args if event.worker is not None else self.busy
+            self._finish(event.worker)
+            if busy_args is not None:
+                busy_args.cancelComplete.emit()
             self.taskCancelled.emit()
+            callback_start = time.monotonic()
             if event.on_cancelled is not None:
                 event.on_cancelled()
+            self._record_metrics(event.worker, 'cancelled', time.monotonic() - callback_start)
             return True
         elif isinstance(event, ErrorEvent):
             LOGGER.info('Task error')
-            self.reset()
+            self._finish(event.worker)
             LOGGER.info('Error running task: %s', event.exception)
+            callback_start = time.monotonic()
             if event.error_description is not None:
                 self.error.emit(event.error_description)
+                self._record_metrics(event.worker, 'errored', time.monotonic() - callback_start)
                 self.taskErrored.emit()
             elif event.on_error is not None:
                 event.on_error(event.exception)
+                self._record_metrics(event.worker, 'errored', time.monotonic() - callback_start)
                 self.taskErrored.emit()
             else:
+                self._record_metrics(event.worker, 'errored')
                 raise event.exception
             return True
         return super().event(event)
+
+    def _finish(self, worker):
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if worker is not None and self._keyed_workers.get(worker.key) is worker:
+                del self._keyed_workers[worker.key]
+        if worker in self._progress_pending:
+            self._progress_pending.remove(worker)
+        if worker in self._running:
+            self._running.remove(worker)
+            self.reset()
+            self.busyTasksChanged.emit(self.busyTasks)
+        elif worker is None:
+            self.reset()
+
+    @property
+    def busyTasks(self):
+        """property::busyTasks
+        The busy args of each running task that shows progress, in the order they were started
+        """
+        return [w.busy_args for w in self._running if w is not None and w.busy_args is not None]
     
-    def cancel(self):
-        if not self._is_cancelled:
-            if self.busy:
-                self.busy.updateProgress(self.busy.progress, self.tr('Cancelling...'))
-            self._is_cancelled = True
+    def cancel(self, group=None):
+        """function::cancel(self, group=None)
+        Cancels all running and queued tasks, or only those in the given group
+        """
+        with self._lock:
+            workers = [w for w in self._workers if group is None or w.group == group]
+        for worker in workers:
+            self._cancel_worker(worker)
+
+    def _cancel_worker(self, worker):
+        if worker.isCancelled():
+            return
+        if worker.busy_args:
+            worker.busy_args.updateProgress(worker.busy_args.progress, self.tr('Cancelling...'))
+        worker.cancel()
     
     def isCancelled(self):
-        return self._is_cancelled
+        """function::isCancelled(self)
+        When called from a task, returns True if that task has been cancelled.
+        Otherwise returns True if any task is being cancelled.
+        """
+        worker = _current_worker()
+        if worker is not None:
+            return worker.isCancelled()
+        with self._lock:
+            return any(w.isCancelled() for w in self._workers)
     
     def raiseForCancelled(self):
-        if self._is_cancelled:
+        if self.isCancelled():
             raise TaskCancelled()
 
     def reset(self):
-        self.busy = BusyArgs(False, description=None)
-        self._is_cancelled = False
+        running = self.busyTasks
+        self.busy = running[-1] if running else BusyArgs(False, description=None)
     
     busyChanged = pyqtSignal(BusyArgs)
+    busyTasksChanged = pyqtSignal(list)
     error = pyqtSignal(str)
     cancelComplete = pyqtSignal()
     taskCompleted = pyqtSignal()
     taskCancelled = pyqtSignal()
     taskErrored = pyqtSignal()
+    taskMeasured = pyqtSignal(TaskMetrics)
 
     busy = AutoProperty(BusyArgs)
@@ -24,3 +24,4 @@ from .plot_toolbar_options import PlotToolbarOptions
 from .size import ToggleableFixed, MaxWidth
 from .plot_options import PlotOptionsView
 from .legend_control import LegendControlView
+from .frame_scheduler import FrameScheduler
@@ -0,0 +1,112 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`frame_scheduler`
+Defines the FrameScheduler class, which runs the pending draws of all plots in shared frames
+"""
+import logging
+import time
+import weakref
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+LOGGER = logging.getLogger(__name__)
+
+class FrameScheduler(QObject):
+    """class::FrameScheduler
+    Calls drawFrame on each widget that has requested a frame, in a single timer callback shared by all widgets.
+    The timer only runs while draws are pending. Hidden and minimised widgets are not drawn until they request
+    a frame again after being shown.
+
+    If a widget's draws take longer than frame_interval milliseconds, it is drawn at most once per
+    max_load of the elapsed time, so that a slow plot cannot starve the rest of the application
+    """
+    _instance = None
+
+    def __init__(self, parent=None, frame_interval=16, max_load=0.5):
+        super().__init__(parent)
+        self._frame_interval = frame_interval
+        self._max_load = max_load
+        self._pending = weakref.WeakSet()
+        self._not_before = weakref.WeakKeyDictionary()
+        self._draw_times = weakref.WeakKeyDictionary()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_frame)
+
+    @classmethod
+    def instance(cls):
+        """function::instance(cls)
+        Returns the scheduler shared by the application
+        """
+        if cls._instance is None or sip.isdeleted(cls._instance):
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    def request(self, widget):
+        """function::request(self, widget)
+        Schedules a call to widget.drawFrame in the next frame the widget is visible and not throttled
+        """
+        self._pending.add(widget)
+        self._schedule(self._delay(widget))
+
+    def drawTime(self, widget):
+        """function::drawTime(self, widget)
+        Returns the smoothed time, in seconds, of the widget's recent draws
+        """
+        return self._draw_times.get(widget, 0.0)
+
+    def _delay(self, widget):
+        return max(self._frame_interval, (self._not_before.get(widget, 0.0) - time.monotonic()) * 1000)
+
+    def _schedule(self, interval):
+        if not self._timer.isActive() or self._timer.remainingTime() > interval:
+            self._timer.start(int(interval))
+
+    @staticmethod
+    def _is_visible(widget):
+        return widget.isVisible() and not widget.window().isMinimized()
+
+    def _run_frame(self):
+        pending, self._pending = list(self._pending), weakref.WeakSet()
+        now = time.monotonic()
+        for widget in pending:
+            if sip.isdeleted(widget) or not self._is_visible(widget):
+                continue
+            if self._not_before.get(widget, 0.0) > now:
+                self._pending.add(widget)
+            else:
+                #pylint: disable=broad-except
+                try:
+                    self._draw(widget)
+                except Exception:
+                    LOGGER.exception('Could not draw %s', widget)
+                #pylint: enable=broad-except
+        if self._pending:
+            self._schedule(min(self._delay(widget) for widget in self._pending))
+
+    def _draw(self, widget):
+        start = time.monotonic()
+        widget.drawFrame()
+        end = time.monotonic()
+        draw_time = 0.5 * (self._draw_times.get(widget, end - start) + end - start)
+        self._draw_times[widget] = draw_time
+        if draw_time * 1000 > self._frame_interval:
+            self._not_before[widget] = end + draw_time * (1 / self._max_load - 1)
+        else:
+            self._not_before.pop(widget, None)
@@ -19,5 +19,8 @@ Defines the matplotlib plot view
 """
 from .base import MatPlotLibBase, _RectangleSelector, _SpanSelector
 from .font import MatPlotLibFont
+from .lod import MinMaxPyramid, LevelOfDetailLine
+from .density import DensityImage, aggregate
+from .stream import RingBuffer, StreamingLine
 from .colormap import MatPlotLibColormap
 from .colorbar import MatPlotColorbar
@@ -19,7 +19,7 @@ import math
 import numpy as np
 from datetime import datetime
 
-from PyQt5.QtCore import pyqtSignal, QSize, QTimer
+from PyQt5.QtCore import pyqtSignal, QSize
 from PyQt5.QtWidgets import QVBoxLayout, QWidget, QMenu, QAction, QApplication
 from PyQt5.QtGui import QKeySequence, QImage
 
@@ -39,10 +39,15 @@ from pyqttoolkit.properties import AutoProperty, connect_all, bind
 from pyqttoolkit.models import SpanModel
 from pyqttoolkit.views import TableView
 from pyqttoolkit.colors import interpolate_rgb
+from pyqttoolkit.data import Cache
 from contextlib import contextmanager
 
 from ..tool_type import ToolType
+from ..frame_scheduler import FrameScheduler
 from .font import MatPlotLibFont
+from .lod import LevelOfDetailLine
+from .density import DensityImage
+from .stream import StreamingLine
 
 def _to_finite(value):
     if isinstance(value, pd.Timestamp):
@@ -56,12 +61,80 @@ def _safe_limits(lower, upper):
     upper = _to_finite(upper)
     return min(lower, upper), max(lower, upper)
 
+_DRAW_NONE, _DRAW_OVERLAYS, _DRAW_DATA, _DRAW_ALL = range(4)
+_MIN_TICK_SPACING = 2
+_LABEL_SIZE_CACHE_SIZE = 64
+_LABEL_SIZE_CONTENT_KEY_LIMIT = 256
+_DATE_LABELS_CACHE_SIZE = 16
+
+def _take(labels, indexes):
+    if hasattr(labels, 'iloc'):
+        return list(labels.iloc[indexes])
+    return [labels[i] for i in indexes]
+
+class _DateLabels:
+    def __init__(self, labels):
+        self.date_nums = _date_nums(labels)
+        self.min = float(np.min(self.date_nums))
+        self.max = float(np.max(self.date_nums))
+        steps = np.diff(self.date_nums)
+        self.order = 1 if np.all(steps > 0) else -1 if np.all(steps < 0) else 0
+
+    def positions(self, tick_vals):
+        """Maps date numbers to fractional label indexes, extrapolating linearly past the ends"""
+        n = len(self.date_nums)
+        if self.order == 0 or n < 2:
+            return (n - 1) * (tick_vals - self.min) / (self.max - self.min)
+        date_nums = self.date_nums if self.order > 0 else self.date_nums[::-1]
+        indexes = np.searchsorted(date_nums, tick_vals).clip(1, n - 1)
+        lower, upper = date_nums[indexes - 1], date_nums[indexes]
+        positions = indexes - 1 + (tick_vals - lower) / (upper - lower)
+        return positions if self.order > 0 else n - 1 - positions
+
+def _is_date_dtype(labels):
+    dtype = getattr(labels, 'dtype', None)
+    return dtype is not None and (np.issubdtype(dtype, np.datetime64) or isinstance(dtype, pd.DatetimeTZDtype))
+
+def _date_nums(labels):
+    if _is_date_dtype(labels):
+        index = pd.DatetimeIndex(labels)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        return mdates.date2num(index.values)
+    return np.array([mdates.date2num(label) for label in labels], dtype=float)
+
+def _all_dates(labels):
+    if _is_date_dtype(labels):
+        return True
+    return all(isinstance(x, (np.datetime64, pd.Timestamp)) for x in labels)
+
+@contextmanager
+def _animated(artists):
+    previous = [a.get_animated() for a in artists]
+    for a in artists:
+        a.set_animated(True)
+    try:
+        yield
+    finally:
+        for a, animated in zip(artists, previous):
+            a.set_animated(animated)
+
 def _cartesian_polar_selector(base_class):
     class _CartesianPolarSelector(base_class):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self._polar_projection = isinstance(self.ax, PolarAxes)
+            self._draw_handler = None
         
+        def set_draw_handler(self, handler):
+            self._draw_handler = handler
+
+        def update(self):
+            if self._draw_handler is None or self.useblit:
+                return super().update()
+            self._draw_handler()
+            return False
+
         def _get_data(self, event):
             if self._polar_projection:
                 xdata = event.xdata + 2 * np.pi if event.xdata < 0 else event.xdata
@@ -143,6 +216,12 @@ class MatPlotLibBase(QWidget):
         self._xy_extents = None
         self._background_cache = None
         self._decoration_artists = []
+        self._view_dependent_artists = []
+        self._pending_draw_level = _DRAW_NONE
+        self._pending_artists = []
+        self._data_cache = None
+        self._cache_size = None
+        self._other_draw_events = []
         self._is_panning = False
         
         self._zoom_selector = _RectangleSelector(self._axes, self._zoom_selected, interactive=True)
@@ -159,6 +238,8 @@ class MatPlotLibBase(QWidget):
             ignore_event_outside=True
         )
         self._span.set_on_select_none(self._handle_span_select_none)
+        self._zoom_selector.set_draw_handler(self.drawOverlays)
+        self._span.set_draw_handler(self.drawOverlays)
         self.span = self._previous_span = None
         self._span_center_mouse_event = None
         self._span_left_mouse_event = None
@@ -169,12 +250,6 @@ class MatPlotLibBase(QWidget):
         self._figure.canvas.mpl_connect('resize_event', self._handle_resize)
         self.activateTool(ToolType.span, self.isActiveDefault(ToolType.span))
         self._pan_event = None
-        self._pending_draw = None
-        self._pending_artists_draw = None
-        self._other_draw_events = []
-        self._draw_timer = QTimer(self)
-        self._draw_timer.timeout.connect(self._do_draw_events)
-        self._draw_timer.start(20)
         self._zoom_skew = None
 
         self._menu = QMenu(self)
@@ -193,6 +268,7 @@ class MatPlotLibBase(QWidget):
         self._table_view = None
         self._single_axis_zoom_enabled = True
         self._cached_label_width_height = None
+        self._cached_date_labels = None
 
         if hasattr(type(self), 'dataChanged'):
             self.dataChanged.connect(self._on_data_changed)
@@ -254,7 +330,7 @@ class MatPlotLibBase(QWidget):
         if self._legend and not show:
             self._legend.remove()
             self._legend = None
-            self.draw()
+            self.drawOverlays()
         elif show:
             if self._legend:
                 self._legend.remove()
@@ -273,7 +349,7 @@ class MatPlotLibBase(QWidget):
                 for text in self._legend.texts:
                     text.set_color(self._get_legend_text_color())
             self._draggable_legend = DraggableLegend(self._legend)
-            self.draw()
+            self.drawOverlays()
         
     def _get_legend_markerscale(self):
         return 5
@@ -293,15 +369,14 @@ class MatPlotLibBase(QWidget):
                 return
             if legend_index < len(self._legend.texts):
                 self._legend.texts[legend_index].set_text(series_name)
-                self.draw()
+                self.drawOverlays()
     
     def _handle_show_series_changed(self, index, show_series):
         if index < len(self._legend_control.seriesHandles):
             self._set_series_visibility(self._legend_control.seriesHandles[index], show_series)
         if self._legend is not None:
             self._show_legend(self._legend_control.showLegend)
-        else:
-            self.draw()
+        self.drawData()
 
     def _set_series_visibility(self, handle, visible):
         if not handle:
@@ -391,6 +466,7 @@ class MatPlotLibBase(QWidget):
 
     def _on_data_changed(self):
         self._cached_label_width_height = None
+        self._cached_date_labels = None
 
     def closeEvent(self, event):
         QWidget.closeEvent(self, event)
@@ -508,6 +584,7 @@ class MatPlotLibBase(QWidget):
                     self._options_view.setYLimits(float(y_min), float(y_max))
             axes.set_xlim(*_safe_limits(x_min, x_max))
             axes.set_ylim(*_safe_limits(y_min, y_max))
+            self._update_view_dependent_artists()
         finally:
             self._setting_axis_limits = False
 
@@ -551,11 +628,10 @@ class MatPlotLibBase(QWidget):
         self._xy_extents = x_extent, y_extent
 
     def _get_xy_extents(self):
-        if self.data is None:
-            return (0, 0), (0, 0)
-        if self._xy_extents is None:
-            return self._get_data_xy_extents()
-        return self._xy_extents
+        # Extents set by zooming, panning or streaming apply whether or not the plot has data
+        if self._xy_extents is not None:
+            return self._xy_extents
+        return self._get_data_xy_extents()
     
     def _get_data_xy_extents(self):
         if self.data is None:
@@ -612,7 +688,7 @@ class MatPlotLibBase(QWidget):
         x_min, x_max = self._round_to_bin_width(x_min, x_max)
         self._update_span_rect(x_min, x_max)
         self.span = SpanModel(self, x_min, x_max)
-        self.draw()
+        self.drawOverlays()
 
     def _handle_span_select_none(self):
         self.span = None
@@ -686,7 +762,7 @@ class MatPlotLibBase(QWidget):
         x_min, x_max = self._round_to_bin_width(x_min, x_max)
         self._update_span_rect(x_min, x_max)
         self.span = SpanModel(self, x_min, x_max)
-        self.draw()
+        self.drawOverlays()
         self._span.active = True
         self._span_center_mouse_event = self._span_left_mouse_event = self._span_right_mouse_event = None
 
@@ -724,7 +800,7 @@ class MatPlotLibBase(QWidget):
             for r in [span_tool.rect]:
                 self._add_artist(r, axes=axes)
         span_tool.active = active
-        self.draw()
+        self.drawOverlays()
         
     def activateTool(self, tool_type, active):
         if tool_type == ToolType.zoom:
@@ -753,43 +829,165 @@ class MatPlotLibBase(QWidget):
         if artist in self._decoration_artists:
             self._decoration_artists.remove(artist)
     
+    def addViewDependentArtist(self, artist):
+        """function::addViewDependentArtist(self, artist)
+        Adds an object whose update_view method is called when the axes limits or the plot size change,
+        such as a LevelOfDetailLine
+        """
+        self._view_dependent_artists.append(artist)
+        artist.update_view()
+        self.drawData()
+
+    def removeViewDependentArtist(self, artist):
+        if artist in self._view_dependent_artists:
+            self._view_dependent_artists.remove(artist)
+
+    def plotLevelOfDetail(self, x, y, axes=None, **kwargs):
+        """function::plotLevelOfDetail(self, x, y, axes=None, **kwargs)
+        Plots the line x, y, showing only the points that are distinguishable at the current zoom and size.
+        x must be sorted in ascending order. Returns the LevelOfDetailLine, whose line property is the matplotlib line
+        """
+        axes = axes or self._axes
+        line, = axes.plot(x[:0], y[:0], **kwargs)
+        level_of_detail = LevelOfDetailLine(line, x, y)
+        self.addViewDependentArtist(level_of_detail)
+        return level_of_detail
+
+    def plotDensity(self, x, y, values=None, colormap=None, axes=None, **kwargs):
+        """function::plotDensity(self, x, y, values=None, colormap=None, axes=None, **kwargs)
+        Plots the points x, y as an image of the number of points, or their mean value, under each pixel.
+        The image is re-aggregated when the view changes. Returns the DensityImage, whose image property can be
+        used as the mappable of a colorbar
+        """
+        density = DensityImage(axes or self._axes, x, y, values=values, colormap=colormap, **kwargs)
+        self.addViewDependentArtist(density)
+        return density
+
+    def addStream(self, capacity, axes=None, **kwargs):
+        """function::addStream(self, capacity, axes=None, **kwargs)
+        Plots a line which shows the last capacity points passed to appendPoints. Returns the StreamingLine
+        """
+        line, = (axes or self._axes).plot([], [], **kwargs)
+        return StreamingLine(line, capacity)
+
+    def appendPoints(self, series, x, y, scroll_fraction=0.25):
+        """function::appendPoints(self, series, x, y, scroll_fraction=0.25)
+        Appends the points x, y to the StreamingLine series and redraws the data.
+        If the last point was in view and the new points go past the x limit, the view is scrolled forward by
+        scroll_fraction of its width, so that the axes are only redrawn once in a while
+        """
+        previous_x = series.last_x()
+        series.append(x, y)
+        (x_min, x_max), y_limits = self._get_actual_xy_extents()
+        last_x = series.last_x()
+        following = previous_x is None or previous_x <= x_max
+        if following and last_x is not None and last_x > x_max and x_max > x_min:
+            width = x_max - x_min
+            x_max = last_x + scroll_fraction * width
+            self._xy_extents = (x_max - width, x_max), y_limits
+            self._set_axes_limits()
+            self.draw()
+        else:
+            self.drawData()
+
+    def _update_view_dependent_artists(self):
+        for artist in self._view_dependent_artists:
+            artist.update_view()
+
     def _handle_resize(self, _event):
         self._update_ticks()
+        self._update_view_dependent_artists()
         return self.draw()
 
 
     def _draw(self, artists=None, axes=None):
         if artists is None:
-            def _update():
-                for a in self._decoration_artists:
-                    a.remove()
-                self._canvas.draw()
-                self._background_cache = self._canvas.copy_from_bbox(self._figure.bbox)
-                for a in self._decoration_artists:
-                    axes.add_artist(a)
-                    axes.draw_artist(a)
-                self._canvas.update()
-            self._pending_draw = _update
+            self._request_draw(_DRAW_ALL)
         else:
-            def _update():
-                if self._background_cache is None:
-                    raise RuntimeError('Must run draw before drawing artists!')
-                self._canvas.restore_region(self._background_cache)
-                for a in artists:
-                    axes.draw_artist(a)
-                self._canvas.update()
-            self._pending_artists_draw = _update
+            self._pending_artists.extend(artists)
+            self._request_draw(_DRAW_OVERLAYS)
+
+    def _request_draw(self, level):
+        self._pending_draw_level = max(self._pending_draw_level, level)
+        FrameScheduler.instance().request(self)
 
     def draw(self, artists=None):
+        """function::draw(self, artists=None)
+        Redraws the whole figure, or, if artists are given, draws them over the cached data layer
+        """
         return self._draw(artists, self._axes)
 
-    def _do_draw_events(self):
-        if self._pending_draw is not None:
-            self._pending_draw()
-            self._pending_draw = None
-        if self._pending_artists_draw is not None:
-            self._pending_artists_draw()
-            self._pending_artists_draw = None
+    def drawData(self):
+        """function::drawData(self)
+        Redraws the data artists and overlays over the cached background, for changes which do not affect the axes
+        """
+        self._request_draw(_DRAW_DATA)
+
+    def drawOverlays(self):
+        """function::drawOverlays(self)
+        Redraws the overlays (decoration artists, legends and selectors) over the cached data layer
+        """
+        self._request_draw(_DRAW_OVERLAYS)
+
+    def _overlay_artists(self):
+        artists = [*self._decoration_artists, *self._zoom_selector.artists, *self._span.artists]
+        artists.extend(axes.legend_ for axes in self._figure.axes if axes.legend_ is not None)
+        return list(dict.fromkeys(artists))
+
+    def _data_artists(self, overlays):
+        overlays = set(overlays)
+        artists = []
+        for axes in sorted(self._figure.axes, key=lambda a: a.get_zorder()):
+            if not axes.get_visible():
+                continue
+            data = {*axes.lines, *axes.collections, *axes.images, *axes.patches}.difference(overlays)
+            if not data:
+                continue
+            # Artists stacked above the data, such as spines, are redrawn with it, in the order of a full draw
+            lowest = min(a.get_zorder() for a in data)
+            children = [
+                a for a in axes.get_children()
+                if a is not axes.patch and a not in overlays and (a in data or a.get_zorder() >= lowest)
+            ]
+            artists.extend(sorted(children, key=lambda a: a.get_zorder()))
+        return artists
+
+    def _render(self, level, artists):
+        overlays = self._overlay_artists()
+        data = self._data_artists(overlays)
+        extra = set(artists).difference(overlays)
+        if extra.intersection(data):
+            level = max(level, _DRAW_DATA)
+        extra = [a for a in dict.fromkeys(artists) if a in extra]
+        if self._background_cache is None or self._cache_size != self._canvas.get_width_height():
+            level = _DRAW_ALL
+        elif self._data_cache is None:
+            level = max(level, _DRAW_DATA)
+        if level >= _DRAW_ALL:
+            with _animated(data + overlays):
+                self._canvas.draw()
+            self._background_cache = self._canvas.copy_from_bbox(self._figure.bbox)
+            self._cache_size = self._canvas.get_width_height()
+        if level >= _DRAW_DATA:
+            self._canvas.restore_region(self._background_cache)
+            for a in data:
+                self._figure.draw_artist(a)
+            self._data_cache = self._canvas.copy_from_bbox(self._figure.bbox)
+        else:
+            self._canvas.restore_region(self._data_cache)
+        for a in overlays + extra:
+            if a.axes is None or a.axes.get_visible():
+                self._figure.draw_artist(a)
+        self._canvas.update()
+
+    def drawFrame(self):
+        """function::drawFrame(self)
+        Runs the pending draws. This is called by the FrameScheduler
+        """
+        level, artists = self._pending_draw_level, self._pending_artists
+        self._pending_draw_level, self._pending_artists = _DRAW_NONE, []
+        if level != _DRAW_NONE:
+            self._render(level, artists)
         if self._other_draw_events:
             for draw_event in self._other_draw_events:
                 draw_event()
@@ -797,6 +995,12 @@ class MatPlotLibBase(QWidget):
 
     def addDrawEvent(self, draw_event):
         self._other_draw_events.append(draw_event)
+        FrameScheduler.instance().request(self)
+
+    def showEvent(self, event):
+        QWidget.showEvent(self, event)
+        if self._pending_draw_level != _DRAW_NONE or self._other_draw_events:
+            FrameScheduler.instance().request(self)
 
     def resetZoom(self):
         self._secondary_y_extent = self._secondary_x_extent = None
@@ -849,14 +1053,34 @@ class MatPlotLibBase(QWidget):
         self._show_table_action.setEnabled(self.canShowTable())
         self._menu.exec_(event.globalPos())
 
-    def copyToClipboard(self):
+    def _rendered_image(self):
+        """Returns a copy of the image shown on the canvas, or None if it has not been rendered at its current size"""
+        self.drawFrame()
+        if self._background_cache is None or self._cache_size != self._canvas.get_width_height():
+            return None
+        buffer = self._canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        image = QImage(buffer, width, height, width * 4, QImage.Format_RGBA8888).copy()
+        image.setDevicePixelRatio(self._canvas.device_pixel_ratio)
+        return image
+
+    def _savefig_image(self):
         with BytesIO() as buffer:
             self._figure.savefig(buffer, facecolor=self._figure.get_facecolor())
-            QApplication.clipboard().setImage(QImage.fromData(buffer.getvalue()))
+            return QImage.fromData(buffer.getvalue())
+
+    def copyToClipboard(self):
+        image = self._rendered_image()
+        QApplication.clipboard().setImage(image if image is not None else self._savefig_image())
 
     def saveAsImage(self):
-        filename = self._file_dialog_service.get_save_filename(self, self.tr('Portable Network Graphics (*.png)'))
-        if filename:
+        filename = self._file_dialog_service.get_save_filename(self, self.tr(
+            'Portable Network Graphics (*.png);;Scalable Vector Graphics (*.svg);;Portable Document Format (*.pdf)'
+        ))
+        if not filename:
+            return
+        image = self._rendered_image() if filename.lower().endswith('.png') else None
+        if image is None or not image.save(filename, 'PNG'):
             self._figure.savefig(filename, facecolor=self._figure.get_facecolor())
 
     def showTable(self):
@@ -871,7 +1095,7 @@ class MatPlotLibBase(QWidget):
         if not self.data:
             return
         if hasattr(self.data, 'x_labels'):
-            if len(self.data.x_labels) > 0 and all(isinstance(x, (np.datetime64, pd.Timestamp)) for x in self.data.x_labels):
+            if self._date_labels(self.data.x_labels) is not None:
                 x_labels = self.data.x_labels
                 self._update_date_xticks(x_labels)
                 x_ticks_rotation = 0.0
@@ -887,7 +1111,7 @@ class MatPlotLibBase(QWidget):
                 self._adjust_to_xticklabels_height(self._axes.get_xticklabels(), rotation)
 
         if hasattr(self.data, 'y_labels'):
-            if len(self.data.y_labels) > 0 and all(isinstance(y, (np.datetime64, pd.Timestamp)) for y in self.data.y_labels):
+            if self._date_labels(self.data.y_labels) is not None:
                 y_labels = self.data.y_labels
                 self._update_date_yticks(y_labels)
             else:
@@ -895,12 +1119,13 @@ class MatPlotLibBase(QWidget):
                 y_ticks, y_labels, _ = self._get_labels(self.data.y_labels, step, horizontal=False)
                 self._axes.set_yticks(y_ticks)
                 self._axes.set_yticklabels(y_labels)
-                self._adjust_to_yticklabels_width(y_labels)
+                # All of the labels are measured, so that the width does not change as the plot is panned
+                self._adjust_to_yticklabels_width(self.data.y_labels)
 
     def _adjust_to_yticklabels_width(self, labels):
         sizes = self._divider.get_horizontal()
-        ticklabels_font_family = self._axes.yaxis.get_ticklabels()[0].get_family() if labels else None
-        ticklabels_font_size = self._axes.yaxis.get_ticklabels()[0].get_size() if labels else None
+        ticklabels_font_family = self._axes.yaxis.get_ticklabels()[0].get_family() if len(labels) else None
+        ticklabels_font_size = self._axes.yaxis.get_ticklabels()[0].get_size() if len(labels) else None
         width, _ = self._get_labels_width_height(
             labels, font_family=ticklabels_font_family, font_size=ticklabels_font_size)
 
@@ -943,13 +1168,23 @@ class MatPlotLibBase(QWidget):
         self._axes.set_xticks(ipositions, tick_formats)
         self._axes.set_xlabel(axis_label)
 
+    def _date_labels(self, labels):
+        """Returns the _DateLabels for labels, or None if they are not all dates.
+        Entries are keyed by the identity of the labels and keep them alive, so that the conversion
+        only happens when the data changes"""
+        if len(labels) == 0:
+            return None
+        if self._cached_date_labels is None:
+            self._cached_date_labels = Cache(_DATE_LABELS_CACHE_SIZE)
+        _, date_labels = self._cached_date_labels.setdefault(
+            (id(labels), len(labels)), lambda: (labels, _DateLabels(labels) if _all_dates(labels) else None))
+        return date_labels
+
     def _determine_date_ticks(self, labels, axis_obj, axis_title, extent):
+        date_labels = self._date_labels(labels)
         e0, e1 = extent
         imin, imax = max(0, math.floor(e0)), min(math.ceil(e1), len(labels) - 1)
-        # Convert all labels to date numbers for robust min/max handling
-        label_dates = [mdates.date2num(lbl) for lbl in labels]
-        date_num_min = min(label_dates)
-        date_num_max = max(label_dates)
+        date_num_min, date_num_max = date_labels.min, date_labels.max
 
         locator = mdates.AutoDateLocator(maxticks=max(1, min(imax - imin, 25)))
         offset_formats = ['', '%Y', '%Y-%b', '%Y-%b', '%Y-%m-%d', '%Y-%m-%d']
@@ -964,12 +1199,9 @@ class MatPlotLibBase(QWidget):
             return ipositions, tick_formats, axis_label
 
         # Ensure correct order for tick_values
-        if label_dates[imin] <= label_dates[imax]:
-            tick_vals = locator.tick_values(labels[imin], labels[imax])
-            ipositions = (len(labels) - 1) * (tick_vals - date_num_min) / (date_num_max - date_num_min) - 0.5
-        else:
-            tick_vals = locator.tick_values(labels[imax], labels[imin])
-            ipositions = (len(labels) - 1) * (tick_vals[::-1] - date_num_min) / (date_num_max - date_num_min) - 0.5
+        date_min, date_max = sorted((date_labels.date_nums[imin], date_labels.date_nums[imax]))
+        tick_vals = locator.tick_values(mdates.num2date(date_min), mdates.num2date(date_max))
+        ipositions = date_labels.positions(tick_vals) - 0.5
 
         tick_formats = formatter.format_ticks(tick_vals)
         axis_label = f'{axis_title} ({formatter.get_offset()})' if formatter.get_offset() else axis_title
@@ -997,29 +1229,41 @@ class MatPlotLibBase(QWidget):
             step = int(step)
         if horizontal and (visible_points / step) * size > plot_size:
             labels_rotation = 30
-        indexes = list(range(len(labels)))
-        display_labels = list(labels)
-        for i in indexes:
-            if i % step:
-                display_labels[i] = ''
+        stop = min(len(labels), max(0, end + step + 1))
+        if visible_points <= plot_size / _MIN_TICK_SPACING:
+            indexes = np.arange(max(0, start - 1), stop)
+        else:
+            indexes = np.arange(max(0, start - start % step), stop, step)
+        display_labels = [
+            label if i % step == 0 else '' for i, label in zip(indexes, _take(labels, indexes))
+        ]
         return indexes, display_labels, labels_rotation
 
     def _get_labels_width_height(self, labels, font_family=None, font_size=None, rotation=None):
-        self._cached_label_width_height = self._cached_label_width_height or {}
-        cache_key = (tuple(labels), ''.join([str(i) for i in (font_family, font_size)]))
-        if cache_key not in self._cached_label_width_height:
-            font = MatPlotLibFont(font=font_family) if font_family else MatPlotLibFont.default()
-            width = 0
-            height = 0
-            font_size = font_size or matplotlib.rcParams['font.size']
-            for label in labels:
-                next_width, next_height = font.get_size(str(label), font_size, self._figure.dpi)
-                width = max(width, next_width)
-                height = max(height, next_height)
-            self._cached_label_width_height[cache_key] = width, height
-        width, height = self._cached_label_width_height[cache_key]
+        if self._cached_label_width_height is None:
+            self._cached_label_width_height = Cache(_LABEL_SIZE_CACHE_SIZE)
+        font_key = ''.join([str(i) for i in (font_family, font_size)])
+        # Long label sets are keyed by identity, to avoid hashing every label on each zoom step.
+        # The labels are kept in the entry so that their id cannot be reused while it is cached
+        if len(labels) > _LABEL_SIZE_CONTENT_KEY_LIMIT:
+            cache_key = (id(labels), len(labels), font_key)
+            entry = self._cached_label_width_height.setdefault(
+                cache_key, lambda: (labels, *self._measure_labels(labels, font_family, font_size)))
+        else:
+            cache_key = (tuple(labels), font_key)
+            entry = self._cached_label_width_height.setdefault(
+                cache_key, lambda: (None, *self._measure_labels(labels, font_family, font_size)))
+        _, width, height = entry
         return (abs(width * np.cos(np.radians(rotation))), abs(width * np.sin(np.radians(rotation)) + height)) if rotation is not None else (width, height)
 
+    def _measure_labels(self, labels, font_family, font_size):
+        if len(labels) == 0:
+            return 0, 0
+        font = MatPlotLibFont(font=font_family) if font_family else MatPlotLibFont.default()
+        font_size = font_size or matplotlib.rcParams['font.size']
+        widths, height = font.get_sizes(labels, font_size, self._figure.dpi)
+        return float(widths.max()), height
+
     def _create_new_axes(self, nx=1, ny=1) -> Axes:
         axes = Axes(self._figure, self._divider.get_position())
         axes.set_axes_locator(self._divider.new_locator(nx=nx, ny=ny))
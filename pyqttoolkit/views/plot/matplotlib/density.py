@@ -0,0 +1,91 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`density`
+Defines functions and classes which show large point clouds as images of point density
+"""
+import numpy as np
+import matplotlib.dates as mdates
+
+def _to_numeric(values):
+    values = np.asarray(values)
+    return mdates.date2num(values) if np.issubdtype(values.dtype, np.datetime64) else values.astype(float, copy=False)
+
+def aggregate(x, y, x_limits, y_limits, shape, values=None):
+    """function::aggregate(x, y, x_limits, y_limits, shape, values=None)
+    Bins the points x, y within the limits into a grid of shape (rows, columns), with row 0 at the lower y limit.
+    Returns the number of points in each cell, or, if values are given, the mean of the values of the points in each cell.
+    Empty cells are NaN
+    """
+    rows, columns = shape
+    (x_min, x_max), (y_min, y_max) = sorted(x_limits), sorted(y_limits)
+    x, y = _to_numeric(x), _to_numeric(y)
+    with np.errstate(invalid='ignore'):
+        in_view = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    if values is not None:
+        values = np.asarray(values, dtype=float)
+        in_view &= np.isfinite(values)
+        values = values[in_view]
+    column = ((x[in_view] - x_min) * (columns / ((x_max - x_min) or 1))).astype(np.intp)
+    row = ((y[in_view] - y_min) * (rows / ((y_max - y_min) or 1))).astype(np.intp)
+    cell = np.minimum(row, rows - 1) * columns + np.minimum(column, columns - 1)
+    counts = np.bincount(cell, minlength=rows * columns).reshape(rows, columns).astype(float)
+    empty = counts == 0
+    if values is not None:
+        counts = np.bincount(cell, weights=values, minlength=rows * columns).reshape(rows, columns) / np.where(empty, 1, counts)
+    counts[empty] = np.nan
+    return counts
+
+class DensityImage:
+    """class::DensityImage
+    Shows the points x, y on axes as an image with a cell for every cell_size pixels of the axes, coloured by
+    the number of points in the cell or, if values are given, by their mean value, using the MatPlotLibColormap colormap.
+    Drawing cost depends on the size of the plot rather than the number of points.
+
+    update_view must be called when the limits of the axes or the size of the plot change
+    """
+    def __init__(self, axes, x, y, values=None, colormap=None, cell_size=1, **kwargs):
+        self._x = _to_numeric(x)
+        self._y = _to_numeric(y)
+        self._values = values
+        self._cell_size = cell_size
+        self._view = None
+        if colormap is not None and colormap.colormap is not None:
+            kwargs.setdefault('cmap', colormap.colormap)
+        self._image = axes.imshow(
+            np.full((1, 1), np.nan), origin='lower', aspect='auto', interpolation='nearest', **kwargs
+        )
+        self._fixed_limits = colormap is not None and colormap.has_limits
+        if self._fixed_limits:
+            self._image.set_clim(*colormap.limits)
+
+    @property
+    def image(self):
+        return self._image
+
+    def update_view(self):
+        axes = self._image.axes
+        x_limits, y_limits = tuple(sorted(axes.get_xlim())), tuple(sorted(axes.get_ylim()))
+        extent = axes.get_window_extent()
+        shape = max(1, int(extent.height / self._cell_size)), max(1, int(extent.width / self._cell_size))
+        if self._view == (x_limits, y_limits, shape):
+            return
+        self._view = x_limits, y_limits, shape
+        grid = aggregate(self._x, self._y, x_limits, y_limits, shape, self._values)
+        self._image.set_data(grid)
+        self._image.set_extent((*x_limits, *y_limits))
+        if not self._fixed_limits and np.isfinite(grid).any():
+            self._image.set_clim(np.nanmin(grid), np.nanmax(grid))
@@ -14,35 +14,78 @@
 # You should have received a copy of the GNU General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+from threading import Lock
+
+import numpy as np
 from matplotlib import rcParams
 from matplotlib.font_manager import findfont, FontProperties
 from fontTools.ttLib import TTFont
-from fontTools.ttLib.tables._c_m_a_p import CmapSubtable
+
+class _FontMetrics:
+    def __init__(self, font_file):
+        font = TTFont(font_file, lazy=True)
+        try:
+            cmap_table = font['cmap']
+            cmap = cmap_table.getcmap(3, 1)
+            cmap = cmap.cmap if cmap is not None else cmap_table.getBestCmap()
+            metrics = font['hmtx'].metrics
+            self.units_per_em = font['head'].unitsPerEm
+        finally:
+            font.close()
+        self.notdef_width = metrics['.notdef'][0]
+        self.widths = np.full(max(cmap, default=0) + 1, self.notdef_width, dtype=np.int64)
+        for codepoint, glyph in cmap.items():
+            if glyph in metrics:
+                self.widths[codepoint] = metrics[glyph][0]
+
+    def text_widths(self, texts):
+        """Returns the advance width, in font units, of each of texts"""
+        lengths = np.fromiter(map(len, texts), dtype=np.intp, count=len(texts))
+        codepoints = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+        widths = np.where(
+            codepoints < len(self.widths), self.widths[np.minimum(codepoints, len(self.widths) - 1)], self.notdef_width
+        )
+        ends = np.concatenate(([0], np.cumsum(widths)))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        return ends[offsets[1:]] - ends[offsets[:-1]]
+
+_FONT_METRICS = {}
+_FONT_METRICS_LOCK = Lock()
+
+def _get_font_metrics(font_file):
+    with _FONT_METRICS_LOCK:
+        if font_file not in _FONT_METRICS:
+            _FONT_METRICS[font_file] = _FontMetrics(font_file)
+        return _FONT_METRICS[font_file]
 
 class MatPlotLibFont:
+    """class::MatPlotLibFont
+    Measures text in a TrueType font. The metrics of each font file are loaded once per process
+    """
     def __init__(self, font):
         font_file = findfont(FontProperties(family=font))
         self._is_ttf = font_file.endswith('.ttf')
         if not self._is_ttf:
             raise ValueError('Unknown font type')
-        self._font = TTFont(font_file)
+        self._metrics = _get_font_metrics(font_file)
 
     def get_size(self, text, pointsize, dpi):
         return self._get_ttf_size(text, pointsize, dpi)
+
+    def get_sizes(self, texts, pointsize, dpi):
+        """function::get_sizes(self, texts, pointsize, dpi)
+        Returns an array of the widths of texts and the height of a line, in pixels
+        """
+        units_per_em = self._metrics.units_per_em
+        widths = self._metrics.text_widths([str(text) for text in texts])
+        return (
+            self._convert_to_pixels(widths, pointsize, dpi, units_per_em),
+            self._convert_to_pixels(units_per_em, pointsize, dpi, units_per_em)
+        )
     
     def _get_ttf_size(self, text, pointsize, dpi):
-        cmap = self._font['cmap']
-        t = cmap.getcmap(3,1).cmap
-        s = self._font.getGlyphSet()
-        width = 0
-        for c in text:
-            if ord(c) in t and t[ord(c)] in s:
-                char = s[t[ord(c)]]
-            else:
-                char = s['.notdef']
-            width += char.width
-        units_per_em = self._font['head'].unitsPerEm
-        return self._convert_to_pixels(width, pointsize, dpi, units_per_em), self._convert_to_pixels(units_per_em, pointsize, dpi, units_per_em)
+        widths, height = self.get_sizes([text], pointsize, dpi)
+        return float(widths[0]), height
     
     def _convert_to_pixels(self, value, pointsize, dpi, units_per_em):
         value_pts = value * float(pointsize) / units_per_em
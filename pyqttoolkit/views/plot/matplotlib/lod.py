@@ -0,0 +1,114 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`lod`
+Defines classes which reduce large line series to the points that are visible at screen resolution
+"""
+import numpy as np
+import matplotlib.dates as mdates
+
+def _argmin_argmax(blocks):
+    nan = np.isnan(blocks)
+    argmin = np.where(nan, np.inf, blocks).argmin(axis=1)
+    argmax = np.where(nan, -np.inf, blocks).argmax(axis=1)
+    return argmin, argmax
+
+def _combine_pairs(y, indices, better):
+    if len(indices) % 2:
+        indices = np.append(indices, indices[-1])
+    first, second = indices[0::2], indices[1::2]
+    return np.where(np.isnan(y[first]) | better(y[second], y[first]), second, first)
+
+class MinMaxPyramid:
+    """class::MinMaxPyramid
+    Holds the indices of the minimum and maximum of y in bins of base_bin, 2 * base_bin, 4 * base_bin, ... samples,
+    down to min_bins bins, so that the min/max decimation of any range of y can be looked up rather than computed
+    """
+    def __init__(self, y, base_bin=4, min_bins=64):
+        self._y = y = np.asarray(y, dtype=float)
+        self._levels = []
+        n = len(y)
+        if n < 2 * base_bin:
+            return
+        n_bins = -(-n // base_bin)
+        padded = np.full(n_bins * base_bin, np.nan)
+        padded[:n] = y
+        argmin, argmax = _argmin_argmax(padded.reshape(n_bins, base_bin))
+        offsets = np.arange(n_bins) * base_bin
+        imin = np.minimum(argmin + offsets, n - 1)
+        imax = np.minimum(argmax + offsets, n - 1)
+        bin_size = base_bin
+        self._levels.append((bin_size, imin, imax))
+        while len(imin) > min_bins:
+            imin = _combine_pairs(y, imin, np.less)
+            imax = _combine_pairs(y, imax, np.greater)
+            bin_size *= 2
+            self._levels.append((bin_size, imin, imax))
+
+    @property
+    def levels(self):
+        return [bin_size for bin_size, _, _ in self._levels]
+
+    def indices(self, start, stop, max_bins):
+        """function::indices(self, start, stop, max_bins)
+        Returns the sorted indices of the points to show for y[start:stop], which are either all of the indices,
+        or the minimum and maximum of each bin of the coarsest level with at least max_bins bins in the range
+        """
+        level = None
+        for bin_size, imin, imax in self._levels:
+            if (stop - start) / bin_size < max_bins:
+                break
+            level = bin_size, imin, imax
+        if level is None:
+            return np.arange(start, stop)
+        bin_size, imin, imax = level
+        first, last = start // bin_size, min(-(-stop // bin_size), len(imin))
+        lower, upper = imin[first:last], imax[first:last]
+        indices = np.empty(2 * len(lower), dtype=np.intp)
+        indices[0::2] = np.minimum(lower, upper)
+        indices[1::2] = np.maximum(lower, upper)
+        return indices
+
+class LevelOfDetailLine:
+    """class::LevelOfDetailLine
+    Shows the series x, y on the matplotlib line, reduced to the minimum and maximum of each bin of about a pixel
+    column of the visible x range. x must be sorted in ascending order.
+
+    update_view must be called when the x limits of the axes or the size of the plot change
+    """
+    def __init__(self, line, x, y, base_bin=4):
+        self._line = line
+        self._x = np.asarray(x)
+        self._y = np.asarray(y)
+        self._x_values = mdates.date2num(self._x) if np.issubdtype(self._x.dtype, np.datetime64) else self._x
+        self._pyramid = MinMaxPyramid(self._y, base_bin)
+        self._view = None
+
+    @property
+    def line(self):
+        return self._line
+
+    def update_view(self):
+        axes = self._line.axes
+        x_min, x_max = sorted(axes.get_xlim())
+        pixels = max(1, int(axes.get_window_extent().width))
+        start = max(0, int(np.searchsorted(self._x_values, x_min)) - 1)
+        stop = min(len(self._x_values), int(np.searchsorted(self._x_values, x_max, side='right')) + 1)
+        if self._view == (start, stop, pixels):
+            return
+        self._view = start, stop, pixels
+        indices = self._pyramid.indices(start, stop, pixels)
+        self._line.set_data(self._x[indices], self._y[indices])
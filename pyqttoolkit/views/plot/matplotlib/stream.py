@@ -0,0 +1,112 @@
+# pyqttoolkit
+# Copyright (C) 2018-2019, Simmovation Ltd.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+""":mod:`stream`
+Defines classes for plotting series that are appended to while they are shown
+"""
+import numpy as np
+import matplotlib.dates as mdates
+
+class RingBuffer:
+    """class::RingBuffer
+    Holds the last capacity values appended to it in preallocated memory.
+    Each value is stored twice, capacity elements apart, so that values is always a contiguous view without copying.
+    If dtype is not given, it is that of the values appended, widened as needed when further values are appended
+    """
+    def __init__(self, capacity, dtype=None):
+        self._capacity = capacity
+        self._fixed_dtype = dtype is not None
+        self._data = None if dtype is None else np.empty(2 * capacity, dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self):
+        if self._data is None:
+            return np.empty(0)
+        return self._data[self._start:self._start + self._size]
+
+    def extend(self, values):
+        values = np.asarray(values)
+        if self._data is None:
+            self._data = np.empty(2 * self._capacity, dtype=values.dtype)
+        elif not self._fixed_dtype:
+            dtype = np.result_type(self._data, values)
+            if dtype != self._data.dtype:
+                self._data = self._data.astype(dtype)
+        appended = len(values)
+        values = values[-self._capacity:]
+        end = (self._start + self._size + appended - len(values)) % self._capacity
+        first = min(len(values), self._capacity - end)
+        for offset in (0, self._capacity):
+            self._data[offset + end:offset + end + first] = values[:first]
+            self._data[offset:offset + len(values) - first] = values[first:]
+        size = min(self._capacity, self._size + appended)
+        self._start = (self._start + self._size + appended - size) % self._capacity
+        self._size = size
+
+    def clear(self):
+        self._start = self._size = 0
+
+class StreamingLine:
+    """class::StreamingLine
+    Shows the last capacity points appended to it on the matplotlib line, using memory which does not grow
+    """
+    def __init__(self, line, capacity):
+        self._line = line
+        self._x = RingBuffer(capacity)
+        self._y = RingBuffer(capacity)
+
+    @property
+    def line(self):
+        return self._line
+
+    @property
+    def x(self):
+        return self._x.values
+
+    @property
+    def y(self):
+        return self._y.values
+
+    def append(self, x, y):
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+        self._x.extend(x)
+        self._y.extend(y)
+        self._line.set_data(self._x.values, self._y.values)
+
+    def last_x(self):
+        """function::last_x(self)
+        Returns the x value of the last point, in axes units, or None if there are no points
+        """
+        if not len(self._x):
+            return None
+        x = self._x.values[-1:]
+        return float(mdates.date2num(x)[0] if np.issubdtype(x.dtype, np.datetime64) else x[0])
+
+    def clear(self):
+        self._x.clear()
+        self._y.clear()
+        self._line.set_data([], [])
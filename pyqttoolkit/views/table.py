@@ -23,9 +23,19 @@ from PyQt5.QtGui import QKeySequence
 
 from pyqttoolkit.models.roles import RowSpanRole, ColumnSpanRole
 
+_SPAN_BLOCK_SIZE = 64
+
 class TableView(QTableView):
+    """class::TableView
+    A table view with copy and paste, which shows the cell spans given by the model.
+    If the model has a cellSpans method, returning (row, column, row_span, column_span) for each span, the spans are
+    taken from it. Otherwise the RowSpanRole and ColumnSpanRole of cells are read in blocks of rows as they are scrolled
+    into view, so that large models are not scanned. In that case a span is only shown once the row it starts in has
+    been in view.
+    """
     def __init__(self, parent):
         QTableView.__init__(self, parent)
+        self._checked_span_blocks = set()
         self._menu = QMenu(self)
         self._copy_action = QAction(self.tr('Copy'), self)
         self._copy_action.triggered.connect(self.copy)
@@ -59,13 +69,31 @@ class TableView(QTableView):
         self._copy_action.setEnabled(value)
     
     def setModel(self, model):
+        previous_model = self.model()
+        if previous_model is not None:
+            for signal, slot in self._model_connections(previous_model):
+                try:
+                    signal.disconnect(slot)
+                except TypeError:
+                    pass
         QTableView.setModel(self, model)
+        self._checked_span_blocks.clear()
         if model:
             if model.parent() is None:
                 model.setParent(self)
-            model.dataChanged.connect(self._handle_data_changed)
+            for signal, slot in self._model_connections(model):
+                signal.connect(slot)
             self._update_cell_spans()
 
+    def _model_connections(self, model):
+        return [
+            (model.dataChanged, self._handle_data_changed),
+            (model.modelReset, self._handle_model_reset),
+            (model.layoutChanged, self._handle_model_reset),
+            (model.rowsInserted, self._handle_rows_changed),
+            (model.rowsRemoved, self._handle_rows_changed),
+        ]
+
     def copy(self):
         self._do_copy()
     
@@ -128,18 +156,83 @@ class TableView(QTableView):
         self._menu.exec_(event.globalPos())
 
     def _handle_data_changed(self, start_index, end_index):
+        if self._has_span_list():
+            self._update_cell_spans()
+            return
+        first, last = start_index.row() // _SPAN_BLOCK_SIZE, end_index.row() // _SPAN_BLOCK_SIZE
+        if last - first > len(self._checked_span_blocks):
+            self._checked_span_blocks.difference_update([b for b in self._checked_span_blocks if first <= b <= last])
+        else:
+            self._checked_span_blocks.difference_update(range(first, last + 1))
         self._update_cell_spans(start_index, end_index)
 
+    def _handle_model_reset(self):
+        self.clearSpans()
+        self._checked_span_blocks.clear()
+        self._update_cell_spans()
+
+    def _handle_rows_changed(self, *_args):
+        self._checked_span_blocks.clear()
+        self._update_visible_cell_spans()
+
+    def scrollContentsBy(self, dx, dy):
+        QTableView.scrollContentsBy(self, dx, dy)
+        if dy:
+            self._update_visible_cell_spans()
+
+    def resizeEvent(self, event):
+        QTableView.resizeEvent(self, event)
+        self._update_visible_cell_spans()
+
+    def _has_span_list(self):
+        return hasattr(self.model(), 'cellSpans')
+
     def _update_cell_spans(self, start_index=QModelIndex(), end_index=QModelIndex()):
-        if isinstance(self.model(), QSortFilterProxyModel):
+        model = self.model()
+        if model is None or isinstance(model, QSortFilterProxyModel):
+            return
+        if self._has_span_list():
+            self.clearSpans()
+            for row, column, row_span, column_span in model.cellSpans():
+                self.setSpan(row, column, row_span, column_span)
+            return
+        if start_index.isValid() and end_index.isValid():
+            first, last = self._visible_rows()
+            first, last = max(first, start_index.row()), min(last, end_index.row())
+            if first <= last:
+                self._read_cell_spans(first, last + 1, start_index.column(), end_index.column() + 1)
+        else:
+            self._update_visible_cell_spans()
+
+    def _visible_rows(self):
+        row_count = self.model().rowCount()
+        first = self.rowAt(0)
+        last = self.rowAt(self.viewport().height() - 1)
+        first = 0 if first < 0 else first
+        if last < 0:
+            last = first + max(1, self.viewport().height() // max(1, self.verticalHeader().defaultSectionSize()))
+        return first, min(last, row_count - 1)
+
+    def _update_visible_cell_spans(self):
+        model = self.model()
+        if model is None or isinstance(model, QSortFilterProxyModel) or self._has_span_list():
             return
-        start_index = start_index if start_index.isValid() else self.model().createIndex(0, 0)
-        end_index = end_index if end_index.isValid() else self.model().createIndex(self.model().rowCount(), self.model().columnCount())
-        for row in range(start_index.row(), end_index.row()):
-            for column in range(start_index.column(), end_index.column()):
-                current_index = self.model().createIndex(row, column)
-                row_span = self.model().data(current_index, RowSpanRole)
-                col_span = self.model().data(current_index, ColumnSpanRole)
+        first, last = self._visible_rows()
+        if last < first:
+            return
+        for block in range(first // _SPAN_BLOCK_SIZE, last // _SPAN_BLOCK_SIZE + 1):
+            if block not in self._checked_span_blocks:
+                self._checked_span_blocks.add(block)
+                start = block * _SPAN_BLOCK_SIZE
+                self._read_cell_spans(start, min(start + _SPAN_BLOCK_SIZE, model.rowCount()), 0, model.columnCount())
+
+    def _read_cell_spans(self, first_row, end_row, first_column, end_column):
+        model = self.model()
+        for row in range(first_row, end_row):
+            for column in range(first_column, end_column):
+                current_index = model.createIndex(row, column)
+                row_span = model.data(current_index, RowSpanRole)
+                col_span = model.data(current_index, ColumnSpanRole)
                 if (isinstance(row_span, int) and row_span != self.rowSpan(row, column)) or (isinstance(col_span, int) and col_span != self.columnSpan(row, column)):
                     row_span = row_span if isinstance(row_span, int) else 1
                     col_span = col_span if isinstance(col_span, int) else 1
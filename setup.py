@@ -49,5 +49,5 @@ setup(
     description='A toolkit for PyQt 5',
     long_description=README_CONTENTS,
     long_description_content_type='text/markdown',
-    python_requires='>=3.6'
+    python_requires='>=3.7'
 )
@@ -0,0 +1,174 @@
+import threading
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyqttoolkit.data import Cache, DiskCache, estimate_size
+
+def test_get_returns_set_value():
+    cache = Cache(2)
+    cache['a'] = 1
+    assert cache['a'] == 1
+
+def test_get_raises_key_error_for_missing_key():
+    cache = Cache(2)
+    with pytest.raises(KeyError):
+        cache['a']
+
+def test_least_recently_used_entry_is_evicted():
+    cache = Cache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['a']
+    cache['c'] = 3
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.evictions == 1
+
+def test_entries_are_evicted_when_max_bytes_exceeded():
+    cache = Cache(10, max_bytes=1000)
+    cache['a'] = np.zeros(100)
+    cache['b'] = np.zeros(100)
+    assert 'a' not in cache
+    assert cache.nbytes == 800
+
+def test_setdefault_only_calls_factory_on_miss():
+    cache = Cache(2)
+    calls = []
+    def _factory():
+        calls.append(1)
+        return 42
+    assert cache.setdefault('a', _factory) == 42
+    assert cache.setdefault('a', _factory) == 42
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_delete_group_deletes_matching_keys():
+    cache = Cache(10)
+    cache['project:1:a'] = 1
+    cache['project:1:b'] = 2
+    cache['project:2:a'] = 3
+    cache.delete_group('project:1:')
+    assert 'project:1:a' not in cache
+    assert 'project:1:b' not in cache
+    assert cache['project:2:a'] == 3
+
+def test_delete_group_matches_keys_within_a_segment():
+    cache = Cache(10)
+    for key in ['project:1', 'project:1:a', 'project:12:a', 'project:2:a', 'projects:a']:
+        cache[key] = key
+    cache.delete_group('project:1')
+    assert [key in cache for key in ['project:1', 'project:1:a', 'project:12:a']] == [False] * 3
+    assert cache['project:2:a'] == 'project:2:a'
+    assert cache['projects:a'] == 'projects:a'
+    cache.delete_group('proj')
+    assert len(cache) == 0
+
+def test_estimate_size_measures_dataframes():
+    frame = pd.DataFrame({'a': np.zeros(100), 'b': np.zeros(100)})
+    assert estimate_size(frame) >= 1600
+
+def test_delete_group_deletes_tuple_keys_with_matching_leading_elements():
+    cache = Cache(10)
+    cache[('project', 1, 'a')] = 1
+    cache[('project', 1, 'b')] = 2
+    cache[('project', 12, 'a')] = 3
+    cache['project'] = 4
+    cache.delete_group(('project', 1))
+    assert ('project', 1, 'a') not in cache
+    assert ('project', 1, 'b') not in cache
+    assert cache[('project', 12, 'a')] == 3
+    assert cache['project'] == 4
+
+def test_delete_group_deletes_namedtuple_and_str_subclass_keys():
+    Key = namedtuple('Key', ['project', 'name'])
+    class Name(str):
+        pass
+    cache = Cache(10)
+    cache[Key('project', 'a')] = 1
+    cache[Name('project:a')] = 2
+    cache.delete_group(('project',))
+    cache.delete_group('project')
+    assert Key('project', 'a') not in cache
+    assert Name('project:a') not in cache
+
+def test_deleted_group_keys_can_be_set_again():
+    cache = Cache(10)
+    cache['project:1:a'] = 1
+    cache.delete_group('project:1')
+    cache['project:1:a'] = 2
+    cache.delete_group('project:2')
+    assert cache['project:1:a'] == 2
+    assert len(cache) == 1
+
+def test_concurrent_setdefault_calls_factory_once():
+    cache = Cache(10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    def _factory():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.setdefault('a', _factory))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [42] * 4
+    assert len(calls) == 1
+
+def test_value_computed_for_deleted_group_is_not_stored():
+    cache = Cache(10)
+    def _factory():
+        cache.delete_group('project:1')
+        return 42
+    assert cache.setdefault('project:1:a', _factory) == 42
+    assert 'project:1:a' not in cache
+
+def test_evicted_array_is_spilled_to_disk_and_read_back(tmp_path):
+    spill = DiskCache(str(tmp_path))
+    cache = Cache(1, spill=spill)
+    cache['a'] = np.arange(10)
+    cache['b'] = np.arange(5)
+    assert 'a' in spill
+    assert 'a' in cache
+    value = cache['a']
+    assert isinstance(value, np.memmap)
+    assert np.array_equal(value, np.arange(10))
+    assert 'b' in spill
+
+def test_evicted_data_frame_is_spilled_to_disk_and_read_back(tmp_path):
+    cache = Cache(1, spill=DiskCache(str(tmp_path)))
+    frame = pd.DataFrame({'x': [1, 2, 3], 'y': ['a', 'b', 'c']})
+    cache['a'] = frame
+    cache['b'] = 1
+    pd.testing.assert_frame_equal(cache['a'], frame)
+
+def test_values_not_accepted_by_spill_are_discarded(tmp_path):
+    spill = DiskCache(str(tmp_path))
+    cache = Cache(1, spill=spill)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert 'a' not in cache
+    assert len(spill) == 0
+
+def test_delete_group_and_set_remove_spilled_values(tmp_path):
+    spill = DiskCache(str(tmp_path))
+    cache = Cache(1, spill=spill)
+    cache[('x', 1)] = np.arange(3)
+    cache[('y', 1)] = np.arange(3)
+    cache[('z', 1)] = 1
+    cache.delete_group(('x',))
+    assert ('x', 1) not in cache
+    cache[('y', 1)] = 2
+    assert ('y', 1) not in spill
+    assert cache[('y', 1)] == 2
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,108 @@
+import pandas as pd
+
+from pyqttoolkit.models import DataFrameTableModel
+
+def _frame(rows):
+    return pd.DataFrame({'a': range(rows), 'b': [str(i) for i in range(rows)]})
+
+def test_all_rows_are_available_without_fetch_size(qtbot):
+    model = DataFrameTableModel(None, _frame(10))
+    assert model.rowCount() == 10
+    assert not model.canFetchMore()
+
+def test_rows_are_fetched_in_batches(qtbot):
+    model = DataFrameTableModel(None, _frame(10), fetch_size=4)
+    assert model.rowCount() == 4
+    model.fetchMore()
+    assert model.rowCount() == 8
+    model.fetchMore()
+    assert model.rowCount() == 10
+    assert not model.canFetchMore()
+
+def test_removing_a_row_before_all_are_fetched(qtbot):
+    model = DataFrameTableModel(None, _frame(10), fetch_size=4)
+    model.removeRows(0, 1)
+    assert model.rowCount() == 3
+    assert model.canFetchMore()
+
+def test_removing_a_row_which_has_not_been_fetched(qtbot):
+    model = DataFrameTableModel(None, _frame(10), fetch_size=4)
+    with qtbot.assertNotEmitted(model.rowsRemoved):
+        model.removeRows(6, 1)
+    assert model.rowCount() == 4
+    assert len(model.dataFrame) == 9
+
+def test_cell_text_matches_values(qtbot):
+    frame = pd.DataFrame({
+        'int': [1, 2], 'float': [0.1, float('nan')], 'float32': pd.Series([0.1, 2.5], dtype='float32'),
+        'complex': [1j, 2], 'nullable': pd.array([1, None], dtype='Int64'), 'text': ['x', None], 'date': pd.to_datetime(['2020-01-01', '2020-01-02'])
+    })
+    model = DataFrameTableModel(None, frame)
+    for row in range(2):
+        for column in range(len(frame.columns)):
+            assert model.data(model.index(row, column)) == str(frame.iloc[row, column])
+
+def test_cell_text_is_updated_when_data_frame_changes(qtbot):
+    model = DataFrameTableModel(None, _frame(2000))
+    assert model.data(model.index(1500, 0)) == '1500'
+    frame = _frame(2000)
+    frame['a'] = frame['a'] * 2
+    model.dataFrame = frame
+    assert model.data(model.index(1500, 0)) == '3000'
+
+def test_assigning_changed_values_does_not_reset(qtbot):
+    model = DataFrameTableModel(None, _frame(10))
+    frame = _frame(10)
+    frame.loc[[2, 3, 7], 'a'] = -1
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+    with qtbot.assertNotEmitted(model.modelReset):
+        model.dataFrame = frame
+    assert changed == [(2, 3), (7, 7)]
+    assert model.data(model.index(7, 0)) == '-1'
+
+def test_assigning_more_or_fewer_rows_inserts_or_removes_them(qtbot):
+    model = DataFrameTableModel(None, _frame(10))
+    with qtbot.assertNotEmitted(model.modelReset), qtbot.waitSignal(model.rowsInserted):
+        model.dataFrame = _frame(12)
+    assert model.rowCount() == 12
+    with qtbot.assertNotEmitted(model.modelReset), qtbot.waitSignal(model.rowsRemoved):
+        model.dataFrame = _frame(5)
+    assert model.rowCount() == 5
+
+def test_assigning_more_rows_inserts_those_within_fetch_size(qtbot):
+    model = DataFrameTableModel(None, _frame(50), fetch_size=100)
+    with qtbot.assertNotEmitted(model.modelReset), qtbot.waitSignal(model.rowsInserted) as blocker:
+        model.dataFrame = _frame(120)
+    assert blocker.args[1:] == [50, 99]
+    assert model.rowCount() == 100
+    assert model.canFetchMore()
+
+def test_assigning_fewer_rows_removes_fetched_rows(qtbot):
+    model = DataFrameTableModel(None, _frame(50), fetch_size=20)
+    with qtbot.waitSignal(model.rowsRemoved) as blocker:
+        model.dataFrame = _frame(10)
+    assert blocker.args[1:] == [10, 19]
+    assert model.rowCount() == 10
+    assert not model.canFetchMore()
+
+def test_assigning_different_columns_resets(qtbot):
+    model = DataFrameTableModel(None, _frame(10))
+    with qtbot.waitSignal(model.modelReset):
+        model.dataFrame = pd.DataFrame({'b': range(3)})
+    assert model.columnCount() == 1
+    assert model.rowCount() == 3
+
+def test_data_frame_is_not_copied_if_copy_is_false(qtbot):
+    frame = _frame(10)
+    model = DataFrameTableModel(None, frame, copy=False)
+    assert model.dataFrame is frame
+
+def test_assigning_equal_values_does_not_signal(qtbot):
+    frame = pd.DataFrame({
+        'a': [1.0, float('nan')], 'b': ['x', None], 'c': pd.to_datetime(['2020-01-01', None]),
+        'd': pd.array([1, None], dtype='Int64'), 'e': [[1], None]
+    })
+    model = DataFrameTableModel(None, frame)
+    with qtbot.assertNotEmitted(model.dataChanged), qtbot.assertNotEmitted(model.modelReset):
+        model.dataFrame = frame.copy()
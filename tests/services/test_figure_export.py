@@ -0,0 +1,28 @@
+import os
+
+from PyQt5.QtWidgets import QApplication
+
+from pyqttoolkit.services import TaskRunner, FigureExporter, FigureExport, export_figures
+
+def _plot_line(figure, slope):
+    axes = figure.add_subplot()
+    axes.plot([0, 1], [0, slope])
+
+def test_export_figures_saves_each_format(tmp_path):
+    exports = [
+        FigureExport(str(tmp_path / f'figure.{extension}'), _plot_line, args=[2], figsize=(4, 3), dpi=50)
+        for extension in ('png', 'svg', 'pdf')
+    ]
+    filenames = export_figures(exports)
+    assert filenames == [e.filename for e in exports]
+    assert all(os.path.getsize(f) > 0 for f in filenames)
+
+def test_exporter_saves_figures_in_process_pool(qtbot, tmp_path):
+    task_runner = TaskRunner(QApplication.instance(), max_processes=2)
+    exporter = FigureExporter(task_runner, processes=2)
+    exports = [FigureExport(str(tmp_path / f'{i}.png'), _plot_line, args=[i]) for i in range(5)]
+    results = []
+    exporter.export(exports, on_completed=results.append)
+    qtbot.waitUntil(lambda: bool(results), timeout=60000)
+    assert results[0] == [e.filename for e in exports]
+    assert all(os.path.exists(e.filename) for e in exports)
@@ -0,0 +1,114 @@
+import pytest
+
+from PyQt5.QtCore import QObject
+
+from pyqttoolkit.services import ProjectUpdater, ProjectMemoizer
+
+class Project:
+    def __init__(self):
+        self._a = 1
+        self._b = 10
+
+    @property
+    def a(self):
+        return self._a
+
+    @a.setter
+    def a(self, value):
+        self._a = value
+
+    @property
+    def b(self):
+        return self._b
+
+    def total(self):
+        return self._a + self._b
+
+class ProjectManager(QObject):
+    def __init__(self):
+        super().__init__()
+        self.project = Project()
+
+@pytest.fixture
+def project_manager(qtbot):
+    return ProjectManager()
+
+@pytest.fixture
+def project_updater(project_manager):
+    return ProjectUpdater(project_manager)
+
+@pytest.fixture
+def memoizer(project_updater, project_manager):
+    return ProjectMemoizer(project_updater, project_manager)
+
+def _counted(memoizer, function):
+    calls = []
+    def _function(project, *args):
+        calls.append(args)
+        return function(project, *args)
+    return memoizer.memoize(_function), calls
+
+def test_result_is_cached(memoizer):
+    double_a, calls = _counted(memoizer, lambda project: project.a * 2)
+    assert double_a() == 2
+    assert double_a() == 2
+    assert len(calls) == 1
+
+def test_arguments_are_part_of_the_key(memoizer):
+    add_a, calls = _counted(memoizer, lambda project, x: project.a + x)
+    assert add_a(1) == 2
+    assert add_a(2) == 3
+    assert add_a(1) == 2
+    assert len(calls) == 2
+
+def test_update_to_read_property_invalidates_result(qtbot, memoizer, project_updater, project_manager):
+    double_a, calls = _counted(memoizer, lambda project: project.a * 2)
+    double_a()
+    def _update(_):
+        project_manager.project.a = 5
+    with qtbot.waitSignal(project_updater.projectUpdated):
+        project_updater.update_project(_update, ['a'])
+    assert double_a() == 10
+    assert len(calls) == 2
+
+def test_update_to_other_property_keeps_result(qtbot, memoizer, project_updater):
+    double_a, calls = _counted(memoizer, lambda project: project.a * 2)
+    double_a()
+    with qtbot.waitSignal(project_updater.projectUpdated):
+        project_updater.update_project(lambda _: None, ['b'])
+    double_a()
+    assert len(calls) == 1
+
+def test_update_without_properties_invalidates_everything(qtbot, memoizer, project_updater):
+    double_a, calls = _counted(memoizer, lambda project: project.a * 2)
+    double_a()
+    with qtbot.waitSignal(project_updater.projectUpdated):
+        project_updater.update_project(lambda _: None)
+    double_a()
+    assert len(calls) == 2
+
+def test_calling_project_method_depends_on_every_property(memoizer):
+    total, calls = _counted(memoizer, lambda project: project.total())
+    total()
+    memoizer.invalidate('b')
+    total()
+    assert len(calls) == 2
+
+def test_new_project_invalidates_everything(memoizer, project_manager):
+    double_a, calls = _counted(memoizer, lambda project: project.a * 2)
+    double_a()
+    project_manager.project = Project()
+    double_a()
+    assert len(calls) == 2
+
+def test_project_is_read_only(memoizer):
+    def _set_a(project):
+        project.a = 3
+    with pytest.raises(AttributeError):
+        memoizer.memoize(_set_a)()
+
+def test_functions_with_the_same_name_are_cached_separately(memoizer):
+    double_a = memoizer.memoize(lambda project: project.a * 2)
+    hundred_a = memoizer.memoize(lambda project: project.a * 100)
+    assert double_a() == 2
+    assert hundred_a() == 100
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+
+from PyQt5.QtCore import QObject
+
+from pyqttoolkit.services import ProjectUpdater
+from pyqttoolkit.services.task_runner import EventLoopThread
+
+class Project:
+    def __init__(self):
+        self.value = 1
+
+class ProjectManager(QObject):
+    def __init__(self):
+        super().__init__()
+        self.project = Project()
+
+@pytest.fixture
+def project_updater(qtbot):
+    return ProjectUpdater(ProjectManager())
+
+@pytest.fixture
+def loop():
+    loop_thread = EventLoopThread()
+    yield loop_thread.loop
+    loop_thread.stop()
+
+def _set_value(project, value):
+    def _update(_):
+        project.value = value
+        return value
+    return _update
+
+def test_update_project_async_returns_result_of_update(qtbot, project_updater, loop):
+    project = project_updater.parent().project
+    future = asyncio.run_coroutine_threadsafe(project_updater.update_project_async(_set_value(project, 2), ['value']), loop)
+    with qtbot.waitSignal(project_updater.projectUpdated, timeout=5000) as blocker:
+        qtbot.waitUntil(future.done, timeout=5000)
+    assert future.result() == 2
+    assert project.value == 2
+    assert blocker.args == ['value']
+
+def test_update_project_async_raises_errors_of_update(qtbot, project_updater, loop):
+    def _fail(_):
+        raise ValueError('value')
+    future = asyncio.run_coroutine_threadsafe(project_updater.update_project_async(_fail), loop)
+    qtbot.waitUntil(future.done, timeout=5000)
+    with pytest.raises(ValueError):
+        future.result()
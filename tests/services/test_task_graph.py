@@ -0,0 +1,103 @@
+import time
+import pytest
+
+from PyQt5.QtWidgets import QApplication
+
+from pyqttoolkit.services import TaskRunner, TaskGraph
+
+@pytest.fixture
+def task_graph(qtbot):
+    return TaskGraph(TaskRunner(QApplication.instance(), max_workers=2))
+
+class Outcome:
+    def __init__(self):
+        self.results = None
+        self.errors = None
+        self.cancelled = False
+
+    def run(self, task_graph):
+        task_graph.run(on_completed=self._set_results, on_error=self._set_errors, on_cancelled=self._set_cancelled)
+
+    def _set_results(self, results):
+        self.results = results
+
+    def _set_errors(self, errors):
+        self.errors = errors
+
+    def _set_cancelled(self):
+        self.cancelled = True
+
+    @property
+    def finished(self):
+        return self.results is not None or self.errors is not None or self.cancelled
+
+def test_dependency_results_are_passed_to_dependants(qtbot, task_graph):
+    outcome = Outcome()
+    task_graph.add_task('a', lambda: 2)
+    task_graph.add_task('b', lambda: 3)
+    task_graph.add_task('c', lambda a, b, c: a * b + c, dependencies=['a', 'b'], task_args=[1])
+    outcome.run(task_graph)
+    qtbot.waitUntil(lambda: outcome.finished, timeout=5000)
+    assert outcome.results == {'a': 2, 'b': 3, 'c': 7}
+
+def test_independent_tasks_run_in_parallel(qtbot, task_graph):
+    outcome = Outcome()
+    task_graph.add_task('a', lambda: time.sleep(0.5))
+    task_graph.add_task('b', lambda: time.sleep(0.5))
+    start = time.monotonic()
+    outcome.run(task_graph)
+    qtbot.waitUntil(lambda: outcome.finished, timeout=5000)
+    assert time.monotonic() - start < 0.9
+
+def test_dependants_of_failed_task_are_not_run(qtbot, task_graph):
+    outcome = Outcome()
+    ran = []
+    def _fail():
+        raise ValueError('value')
+    task_graph.add_task('a', _fail)
+    task_graph.add_task('b', lambda a: ran.append('b'), dependencies=['a'])
+    task_graph.add_task('c', lambda: ran.append('c'))
+    outcome.run(task_graph)
+    qtbot.waitUntil(lambda: outcome.finished, timeout=5000)
+    assert isinstance(outcome.errors['a'], ValueError)
+    assert ran == ['c']
+
+def test_cycles_are_rejected(task_graph):
+    task_graph.add_task('a', lambda b: b, dependencies=['b'])
+    task_graph.add_task('b', lambda a: a, dependencies=['a'])
+    with pytest.raises(ValueError):
+        task_graph.run()
+
+class _ManualTaskRunner:
+    def __init__(self):
+        self.tasks = {}
+
+    def run_task(self, task_function, task_args=None, on_completed=None, on_error=None, on_cancelled=None, **_kwargs):
+        self.tasks[task_function.__name__] = on_completed, on_error, on_cancelled
+
+    def cancel(self, _group):
+        pass
+
+def test_graph_finishes_when_a_task_is_cancelled_and_another_completes():
+    task_runner = _ManualTaskRunner()
+    task_graph = TaskGraph(task_runner)
+    outcome = Outcome()
+    def a():
+        pass
+    def b():
+        pass
+    def c(_b):
+        pass
+    task_graph.add_task('a', a)
+    task_graph.add_task('b', b)
+    task_graph.add_task('c', c, dependencies=['b'])
+    outcome.run(task_graph)
+    task_runner.tasks['a'][2]()
+    task_runner.tasks['b'][0](1)
+    assert not task_graph.running
+    assert outcome.cancelled
+    assert 'c' not in task_runner.tasks
+
+def test_key_and_supersede_are_reserved(task_graph):
+    with pytest.raises(ValueError):
+        task_graph.add_task('a', lambda: 1, key='a', supersede=True)
@@ -1,11 +1,15 @@
+import asyncio
 import pytest
 import time
 
 from asyncio import Event, wait_for
+from queue import Queue
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 from pyqttoolkit.services.task_runner import *
+from pyqttoolkit.services.task_runner import _ProcessProgress
 from pytestqt.exceptions import capture_exceptions
 from pytestqt.qt_compat import qt_api
 
@@ -147,3 +151,226 @@ async def test_can_queue_tasks(qtbot, task_runner):
     await wait_for(event_2.wait(), 2)
     assert result_1.value == 42
     assert result_2.value == 42
+
+@pytest.mark.asyncio
+async def test_cancellation_token_is_passed_to_task(qtbot, task_runner):
+    result = Result()
+    def _task(cancellation_token):
+        result.set(cancellation_token)
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=1000):
+        task_runner.run_task(_task)
+    assert isinstance(result.value, CancellationToken)
+
+@pytest.mark.asyncio
+async def test_cancel_group_only_cancels_tasks_in_group(qtbot, task_runner):
+    event_1 = Event()
+    event_2 = Event()
+    result = Result()
+    def _task(cancellation_token):
+        event_1.set()
+        while not event_2.is_set():
+            pass
+        cancellation_token.raiseForCancelled()
+        return 42
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=10000):
+        task_runner.run_task(_task, on_completed=result.set, group='plot')
+        await wait_for(event_1.wait(), 2)
+        task_runner.cancel('export')
+        event_2.set()
+    assert result.value == 42
+
+@pytest.mark.asyncio
+async def test_queued_tasks_run_in_priority_order(qtbot, task_runner):
+    event = Event()
+    order = []
+    def _block():
+        while not event.is_set():
+            pass
+    def _task(value):
+        def _():
+            order.append(value)
+        return _
+    task_runner.run_task(_block)
+    task_runner.run_task(_task('low'), priority=0)
+    task_runner.run_task(_task('high'), priority=10)
+    with qtbot.waitSignals([task_runner.taskCompleted] * 3, timeout=10000):
+        event.set()
+    assert order == ['high', 'low']
+
+@pytest.mark.asyncio
+async def test_tasks_run_concurrently_with_multiple_workers(qtbot, task_runner):
+    task_runner = TaskRunner(QApplication.instance(), max_workers=2)
+    event_1 = Event()
+    event_2 = Event()
+    def _task(own_event, other_event):
+        def _():
+            own_event.set()
+            while not other_event.is_set():
+                pass
+        return _
+    with qtbot.waitSignals([task_runner.taskCompleted] * 2, timeout=10000):
+        task_runner.run_task(_task(event_1, event_2))
+        task_runner.run_task(_task(event_2, event_1))
+    assert len(task_runner.busyTasks) == 0
+
+def _square(value, update_progress, cancellation_token):
+    update_progress(50, 'Squaring')
+    cancellation_token.raiseForCancelled()
+    return value * value
+
+def _raise_value_error():
+    raise ValueError('value')
+
+def _report_progress(update_progress):
+    update_progress(50, 'Working')
+    time.sleep(1)
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return 'process'
+
+def _wait_for_cancellation(cancellation_token):
+    while True:
+        cancellation_token.raiseForCancelled()
+        time.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_process_pool_task_returns_result(qtbot, task_runner):
+    result = Result()
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=30000):
+        task_runner.run_task(_square, task_args=[7], on_completed=result.set, use_process_pool=True)
+    assert result.value == 49
+
+@pytest.mark.asyncio
+async def test_process_pool_task_errors_are_returned(qtbot, task_runner):
+    result = Result()
+    with qtbot.waitSignal(task_runner.taskErrored, timeout=30000):
+        task_runner.run_task(_raise_value_error, on_error=result.set, use_process_pool=True)
+    assert isinstance(result.value, ValueError)
+
+@pytest.mark.asyncio
+async def test_process_pool_tasks_do_not_occupy_a_thread(qtbot, task_runner):
+    results = []
+    with qtbot.waitSignals([task_runner.taskCompleted] * 3, timeout=30000):
+        task_runner.run_task(_sleep, task_args=[2], on_completed=results.append, use_process_pool=True)
+        task_runner.run_task(_sleep, task_args=[2], on_completed=results.append, use_process_pool=True)
+        task_runner.run_task(lambda: 'thread', on_completed=results.append)
+    assert results == ['thread', 'process', 'process']
+
+@pytest.mark.asyncio
+async def test_process_pool_task_progress_is_delivered(qtbot, task_runner):
+    updates = []
+    def _on_busy_tasks_changed(busy_tasks):
+        for busy_args in busy_tasks:
+            busy_args.progressChanged.connect(lambda progress, message: updates.append((progress, message)))
+    task_runner.busyTasksChanged.connect(_on_busy_tasks_changed)
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=30000):
+        task_runner.run_task(_report_progress, use_process_pool=True)
+    assert updates == [(50, 'Working')]
+
+@pytest.mark.asyncio
+async def test_process_pool_task_can_be_cancelled(qtbot, task_runner):
+    task_runner.run_task(_wait_for_cancellation, use_process_pool=True, cancellable=True, group='process')
+    with qtbot.waitSignal(task_runner.taskCancelled, timeout=30000):
+        QTimer.singleShot(2000, lambda: task_runner.cancel('process'))
+
+@pytest.mark.asyncio
+async def test_superseded_task_result_is_not_delivered(qtbot, task_runner):
+    event = Event()
+    results = []
+    def _task(value):
+        def _():
+            while not event.is_set():
+                pass
+            return value
+        return _
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=10000):
+        task_runner.run_task(_task(1), on_completed=results.append, key='plot', supersede=True)
+        task_runner.run_task(_task(2), on_completed=results.append, key='plot', supersede=True)
+        task_runner.run_task(_task(3), on_completed=results.append, key='plot', supersede=True)
+        event.set()
+    assert results == [3]
+
+def test_supersede_requires_key(qtbot, task_runner):
+    with pytest.raises(ValueError):
+        task_runner.run_task(lambda: 42, supersede=True)
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced(qtbot, task_runner):
+    updates = []
+    def _on_busy_tasks_changed(busy_tasks):
+        for busy_args in busy_tasks:
+            busy_args.progressChanged.connect(lambda progress, _: updates.append(progress))
+    task_runner.busyTasksChanged.connect(_on_busy_tasks_changed)
+    def _task(update_progress):
+        for i in range(10000):
+            update_progress(i / 100, 'Working')
+        time.sleep(0.5)
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=10000):
+        task_runner.run_task(_task)
+    assert 0 < len(updates) < 100
+    assert updates[-1] == 99.99
+
+@pytest.mark.asyncio
+async def test_progress_reported_through_task_runner_is_delivered(qtbot, task_runner):
+    updates = []
+    def _on_busy_tasks_changed(busy_tasks):
+        for busy_args in busy_tasks:
+            busy_args.progressChanged.connect(lambda progress, message: updates.append((progress, message)))
+    task_runner.busyTasksChanged.connect(_on_busy_tasks_changed)
+    def _task():
+        task_runner.update_progress(50, 'Working')
+        time.sleep(0.5)
+    with qtbot.waitSignal(task_runner.taskCompleted, timeout=10000):
+        task_runner.run_task(_task)
+    assert updates == [(50, 'Working')]
+
+def test_process_progress_sends_latest_update_when_flushed():
+    progress_queue = Queue()
+    progress = _ProcessProgress(progress_queue, interval=60)
+    for i in range(5):
+        progress(i, f'Step {i}')
+    progress.flush()
+    sent = []
+    while not progress_queue.empty():
+        sent.append(progress_queue.get())
+    assert sent == [(0.0, 'Step 0'), (4.0, 'Step 4')]
+
+@pytest.mark.asyncio
+async def test_coroutine_tasks_run_concurrently(qtbot, task_runner):
+    results = []
+    async def _task(value):
+        await asyncio.sleep(0.5)
+        return value
+    start = time.monotonic()
+    with qtbot.waitSignals([task_runner.taskCompleted] * 3, timeout=10000):
+        for i in range(3):
+            task_runner.run_task(_task, task_args=[i], on_completed=results.append)
+    assert sorted(results) == [0, 1, 2]
+    assert time.monotonic() - start < 1.4
+
+@pytest.mark.asyncio
+async def test_cancelling_coroutine_task_cancels_coroutine(qtbot, task_runner):
+    result = Result()
+    async def _task():
+        await asyncio.sleep(10)
+        result.set(42)
+    with qtbot.waitSignal(task_runner.taskCancelled, timeout=5000):
+        task_runner.run_task(_task)
+        task_runner.cancel()
+    assert result.value is None
+
+@pytest.mark.asyncio
+async def test_task_metrics_are_recorded(qtbot, task_runner):
+    def _task(update_progress):
+        update_progress(50, 'Working')
+        time.sleep(0.2)
+    with qtbot.waitSignal(task_runner.taskMeasured, timeout=10000) as blocker:
+        task_runner.run_task(_task, description='measured')
+    metrics = blocker.args[0]
+    assert metrics.outcome == 'completed'
+    assert metrics.run_time >= 0.2
+    assert metrics.progress_updates == 1
+    summary = task_runner.statistics['measured']
+    assert summary.count == 1
+    assert summary.total('run_time') == metrics.run_time
@@ -0,0 +1,22 @@
+import numpy as np
+
+from pyqttoolkit.views.plot.matplotlib import aggregate
+
+def test_points_are_counted_per_cell():
+    x = np.array([0.1, 0.2, 0.9, 5.0])
+    y = np.array([0.1, 0.1, 0.9, 0.5])
+    grid = aggregate(x, y, (0, 1), (0, 1), (2, 2))
+    assert grid[0, 0] == 2
+    assert grid[1, 1] == 1
+    assert np.isnan(grid[0, 1]) and np.isnan(grid[1, 0])
+
+def test_values_are_averaged_per_cell():
+    x = np.array([0.1, 0.2, 0.9])
+    y = np.array([0.1, 0.1, 0.9])
+    grid = aggregate(x, y, (0, 1), (0, 1), (2, 2), values=[1.0, 3.0, 5.0])
+    assert grid[0, 0] == 2
+    assert grid[1, 1] == 5
+
+def test_points_on_upper_limits_are_included():
+    grid = aggregate([1.0], [1.0], (0, 1), (0, 1), (4, 4))
+    assert grid[3, 3] == 1
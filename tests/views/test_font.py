@@ -0,0 +1,30 @@
+import numpy as np
+
+from fontTools.ttLib import TTFont
+from matplotlib.font_manager import findfont, FontProperties
+
+from pyqttoolkit.views.plot.matplotlib import MatPlotLibFont
+
+def _glyph_widths(font_family, texts, pointsize, dpi):
+    # Measures each character's glyph from the font file, as MatPlotLibFont did before measuring in batches
+    font = TTFont(findfont(FontProperties(family=font_family)))
+    cmap = font['cmap'].getcmap(3, 1).cmap
+    glyphs = font.getGlyphSet()
+    scale = pointsize * dpi / 72 / font['head'].unitsPerEm
+    def _glyph(c):
+        name = cmap.get(ord(c))
+        return glyphs[name if name in glyphs else '.notdef']
+    return [sum(_glyph(c).width for c in text) * scale for text in texts]
+
+def test_batch_widths_match_glyph_widths():
+    font = MatPlotLibFont('DejaVu Sans')
+    texts = ['category 1', '', 'W\u00f6rld \u20ac', 'MMMM', '\U0001f600']
+    widths, height = font.get_sizes(texts, 10, 100)
+    assert np.allclose(widths, _glyph_widths('DejaVu Sans', texts, 10, 100))
+    assert widths[1] == 0
+    assert np.isclose(height, 10 * 100 / 72)
+
+def test_longer_text_is_wider():
+    font = MatPlotLibFont.default()
+    widths, _ = font.get_sizes(['a', 'aa'], 10, 100)
+    assert widths[1] == 2 * widths[0]
@@ -0,0 +1,49 @@
+import logging
+
+from PyQt5.QtWidgets import QWidget
+
+from pyqttoolkit.views.plot import FrameScheduler
+
+class Plot(QWidget):
+    def __init__(self, error=None):
+        super().__init__()
+        self.frames = 0
+        self._error = error
+
+    def drawFrame(self):
+        self.frames += 1
+        if self._error is not None:
+            raise self._error
+
+def _shown_plot(qtbot, error=None):
+    plot = Plot(error)
+    qtbot.addWidget(plot)
+    plot.show()
+    return plot
+
+def test_requests_before_a_frame_are_drawn_once(qtbot):
+    scheduler = FrameScheduler(frame_interval=1)
+    plot = _shown_plot(qtbot)
+    for _ in range(3):
+        scheduler.request(plot)
+    qtbot.waitUntil(lambda: plot.frames > 0, timeout=1000)
+    qtbot.wait(50)
+    assert plot.frames == 1
+
+def test_hidden_widgets_are_not_drawn(qtbot):
+    scheduler = FrameScheduler(frame_interval=1)
+    plot = Plot()
+    qtbot.addWidget(plot)
+    scheduler.request(plot)
+    qtbot.wait(50)
+    assert plot.frames == 0
+
+def test_error_drawing_one_widget_does_not_prevent_others(qtbot, caplog):
+    scheduler = FrameScheduler(frame_interval=1)
+    failing = _shown_plot(qtbot, ValueError('draw'))
+    plot = _shown_plot(qtbot)
+    with caplog.at_level(logging.ERROR):
+        scheduler.request(failing)
+        scheduler.request(plot)
+        qtbot.waitUntil(lambda: failing.frames == 1 and plot.frames == 1, timeout=1000)
+    assert 'Could not draw' in caplog.text
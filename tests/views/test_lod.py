@@ -0,0 +1,39 @@
+import numpy as np
+
+from pyqttoolkit.views.plot.matplotlib import MinMaxPyramid
+
+def test_small_ranges_return_all_indices():
+    pyramid = MinMaxPyramid(np.arange(1000.0))
+    assert np.array_equal(pyramid.indices(10, 20, 100), np.arange(10, 20))
+
+def test_indices_are_sorted_and_bounded_by_pixels():
+    y = np.random.default_rng(0).normal(size=100_000)
+    pyramid = MinMaxPyramid(y)
+    indices = pyramid.indices(0, len(y), 500)
+    assert np.all(np.diff(indices) >= 0)
+    assert 1000 <= len(indices) <= 2000
+
+def test_extremes_of_each_bin_are_kept():
+    y = np.zeros(100_000)
+    y[12_345] = 10
+    y[67_890] = -10
+    indices = MinMaxPyramid(y).indices(0, len(y), 100)
+    assert 12_345 in indices
+    assert 67_890 in indices
+
+def test_nan_values_are_ignored_unless_whole_bin_is_nan():
+    y = np.arange(64.0)
+    y[1] = np.nan
+    pyramid = MinMaxPyramid(y, base_bin=4, min_bins=1)
+    indices = pyramid.indices(0, 64, 16)
+    assert 0 in indices and 3 in indices
+    assert 1 not in indices
+
+def test_extremes_next_to_nan_bins_are_kept_at_coarser_levels():
+    y = np.zeros(4096)
+    y[:4] = np.nan
+    y[5] = 10
+    y[6] = -10
+    indices = MinMaxPyramid(y).indices(0, len(y), 64)
+    assert 5 in indices
+    assert 6 in indices
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from io import BytesIO
+
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+from pyqttoolkit.views.plot.matplotlib import MatPlotLibBase
+
+class Data:
+    def __init__(self, y_labels):
+        self.y_labels = y_labels
+        self.yAxisTitle = 'Category'
+
+    def get_xy_extents(self):
+        return (0, 1), (0, len(self.y_labels))
+
+class LineData:
+    def get_xy_extents(self):
+        return (0, 10), (-1, 1)
+
+class FileDialogService:
+    def __init__(self):
+        self.filename = None
+
+    def get_save_filename(self, _parent, _filters):
+        return self.filename
+
+class Plot(MatPlotLibBase):
+    def __init__(self, data=None, file_dialog_service=None):
+        self.data = data
+        super().__init__(None, file_dialog_service)
+
+@pytest.fixture
+def file_dialog_service():
+    return FileDialogService()
+
+@pytest.fixture
+def plot(qtbot, file_dialog_service):
+    plot = Plot(file_dialog_service=file_dialog_service)
+    qtbot.addWidget(plot)
+    plot.resize(600, 400)
+    plot.show()
+    qtbot.waitExposed(plot)
+    return plot
+
+def _show_rows(plot, start, stop):
+    plot._xy_extents = (0, 1), (start, stop)
+    plot._update_ticks()
+
+def test_only_visible_labels_are_ticked(plot):
+    plot.data = Data([f'label {i}' for i in range(10_000)])
+    _show_rows(plot, 5000, 5010)
+    ticks = plot.axes.get_yticks()
+    assert 4999 <= ticks.min() and ticks.max() <= 5012
+    assert [label.get_text() for label in plot.axes.get_yticklabels()][1:3] == ['label 5000', 'label 5001']
+
+def test_y_tick_labels_width_does_not_change_when_panning(plot):
+    plot.data = Data(['A much longer label than the others'] + [str(i) for i in range(1, 1000)])
+    _show_rows(plot, 500, 510)
+    width = plot.divider.get_horizontal()[0].fixed_size
+    _show_rows(plot, 0, 10)
+    assert plot.divider.get_horizontal()[0].fixed_size == width
+
+def _rendered(plot):
+    plot.drawFrame()
+    return np.asarray(plot._canvas.buffer_rgba()).copy()
+
+def _saved(plot):
+    buffer = BytesIO()
+    plot._figure.savefig(buffer, format='rgba', dpi=plot._figure.dpi)
+    width, height = plot._canvas.get_width_height(physical=True)
+    return np.frombuffer(buffer.getvalue(), dtype=np.uint8).reshape(height, width, 4)
+
+@pytest.fixture
+def line_plot(plot):
+    plot.data = LineData()
+    x = np.linspace(0, 10, 500)
+    line, = plot.axes.plot(x, np.sin(x))
+    plot._set_axes_limits()
+    plot.draw()
+    plot.drawFrame()
+    return plot, line
+
+def test_data_redraw_matches_full_render(line_plot):
+    plot, line = line_plot
+    line.set_ydata(np.cos(line.get_xdata()))
+    plot.drawData()
+    assert np.array_equal(_rendered(plot), _saved(plot))
+
+def test_redraw_after_zoom_matches_full_render(line_plot):
+    plot, _ = line_plot
+    plot._xy_extents = (2, 5), (-0.5, 0.5)
+    plot._set_axes_limits()
+    plot.draw()
+    assert np.array_equal(_rendered(plot), _saved(plot))
+    plot.drawOverlays()
+    assert np.array_equal(_rendered(plot), _saved(plot))
+
+def test_copied_image_has_the_size_of_the_plot(line_plot):
+    plot, _ = line_plot
+    plot.copyToClipboard()
+    image = QApplication.clipboard().image()
+    assert (image.width(), image.height()) == plot._canvas.get_width_height(physical=True)
+
+@pytest.mark.parametrize('extension', ['png', 'svg', 'pdf'])
+def test_save_as_image_writes_the_chosen_format(line_plot, file_dialog_service, tmp_path, extension):
+    plot, _ = line_plot
+    filename = file_dialog_service.filename = str(tmp_path / f'plot.{extension}')
+    plot.saveAsImage()
+    with open(filename, 'rb') as f:
+        header = f.read(16)
+    assert {'png': b'\x89PNG', 'svg': b'<?xml', 'pdf': b'%PDF'}[extension] in header
+    if extension == 'png':
+        image = QImage(filename)
+        assert (image.width(), image.height()) == plot._canvas.get_width_height(physical=True)
+
+def test_appending_past_the_x_limit_scrolls_the_view(plot):
+    stream = plot.addStream(1000)
+    plot.axes.set_xlim(0, 10)
+    plot.axes.set_ylim(-1, 1)
+    for start in range(0, 30, 2):
+        x = np.arange(start, start + 2, dtype=float)
+        plot.appendPoints(stream, x, np.sin(x))
+        plot.drawFrame()
+        x_min, x_max = plot.axes.get_xlim()
+        assert x_max - x_min == pytest.approx(10)
+        assert x_min <= x[-1] <= x_max
+    assert plot.axes.get_ylim() == (-1, 1)
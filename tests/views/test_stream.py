@@ -0,0 +1,32 @@
+import numpy as np
+
+from pyqttoolkit.views.plot.matplotlib import RingBuffer
+
+def test_values_are_in_order_of_appending():
+    buffer = RingBuffer(5)
+    buffer.extend([1.0, 2.0])
+    buffer.extend([3.0])
+    assert list(buffer.values) == [1.0, 2.0, 3.0]
+
+def test_buffer_is_widened_for_values_of_a_wider_type():
+    buffer = RingBuffer(5)
+    buffer.extend([0])
+    buffer.extend([0.7, 1.5])
+    assert list(buffer.values) == [0.0, 0.7, 1.5]
+
+def test_only_last_capacity_values_are_kept():
+    buffer = RingBuffer(4)
+    for start in range(0, 30, 3):
+        buffer.extend(np.arange(start, start + 3, dtype=float))
+    assert list(buffer.values) == [26.0, 27.0, 28.0, 29.0]
+
+def test_values_longer_than_capacity_keep_the_end():
+    buffer = RingBuffer(3)
+    buffer.extend([1.0])
+    buffer.extend(np.arange(10.0))
+    assert list(buffer.values) == [7.0, 8.0, 9.0]
+
+def test_values_is_a_view():
+    buffer = RingBuffer(3)
+    buffer.extend(np.arange(5.0))
+    assert buffer.values.base is not None
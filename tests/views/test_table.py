@@ -0,0 +1,49 @@
+from PyQt5.QtCore import QAbstractTableModel, Qt
+
+from pyqttoolkit.models.roles import RowSpanRole, ColumnSpanRole
+from pyqttoolkit.views import TableView
+
+class SpanModel(QAbstractTableModel):
+    def __init__(self, rows, spans):
+        super().__init__()
+        self._rows = rows
+        self._spans = spans
+        self.span_reads = 0
+
+    def rowCount(self, _parent=None):
+        return self._rows
+
+    def columnCount(self, _parent=None):
+        return 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (RowSpanRole, ColumnSpanRole):
+            self.span_reads += 1
+            if role == RowSpanRole and (index.row(), index.column()) in self._spans:
+                return 2
+            return None
+        if role == Qt.DisplayRole:
+            return f'{index.row()}, {index.column()}'
+        return None
+
+def _table(qtbot, model):
+    table = TableView(None)
+    qtbot.addWidget(table)
+    table.resize(300, 300)
+    table.setModel(model)
+    table.show()
+    qtbot.waitExposed(table)
+    return table
+
+def test_spans_are_only_read_for_visible_rows(qtbot):
+    model = SpanModel(100_000, {(0, 0), (50_000, 0)})
+    table = _table(qtbot, model)
+    assert table.rowSpan(0, 0) == 2
+    assert table.rowSpan(50_000, 0) == 1
+    assert model.span_reads < 1000
+
+def test_spans_are_read_when_scrolled_into_view(qtbot):
+    model = SpanModel(100_000, {(50_000, 0)})
+    table = _table(qtbot, model)
+    table.scrollTo(model.index(50_000, 0), TableView.PositionAtTop)
+    assert table.rowSpan(50_000, 0) == 2